@@ -9,3 +9,6 @@ class Config:
     HOST = os.getenv("API_HOST", "0.0.0.0")
     PORT = int(os.getenv("API_PORT", "8000"))
     DEBUG = os.getenv("API_DEBUG", "false").lower() == "true"
+    # Full tracebacks for expected-but-failed generation errors (upstream down,
+    # bad input); off outside debug so a burst of failures stays cheap to log
+    DEBUG_TRACEBACKS = os.getenv("API_DEBUG_TRACEBACKS", str(DEBUG)).lower() == "true"
@@ -4,71 +4,166 @@ Drop service folders into services/ and they're auto-loaded.
 """
 
 import asyncio
-import json
+import atexit
+import functools
+import hashlib
 import logging
+import queue
+import threading
+import time
 from collections import deque
+from enum import EnumMeta
 from pathlib import Path
-from datetime import datetime
-from contextlib import asynccontextmanager
+from types import MappingProxyType
+from contextlib import asynccontextmanager, suppress
+from logging.handlers import QueueHandler, QueueListener
+from typing import get_args, get_origin
 
+import orjson
 import uvicorn
 import httpx
-from fastapi import FastAPI, Request, Response
+from fastapi import APIRouter, FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.utils import is_body_allowed_for_status_code
+from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from config import Config
-from utils import check_internet
+from utils import check_internet, etag_matches, ORJSONResponse
 from services import load_service_routers, get_loaded_services
 
+# Handlers only enqueue records; a listener thread does the console writes
+# and SSE fan-out so logging never blocks the event loop.
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+
 logging.basicConfig(
     level=logging.DEBUG if Config.DEBUG else logging.INFO,
-    format="%(asctime)s │ %(levelname)-7s │ %(name)-15s │ %(message)s",
-    datefmt="%H:%M:%S"
+    handlers=[QueueHandler(_log_queue)],
+    format="%(message)s",
 )
 logger = logging.getLogger(__name__)
 
-startup_time = None
+startup_time: float | None = None  # time.monotonic() at startup
 
 # ── Live Log Streaming ──
-_log_clients: list[asyncio.Queue] = []
+# One shared ring of (seq, SSE frame) pairs. The handler appends and wakes all
+# SSE clients at once; each client remembers the last seq it has sent.
+# Drop policy: the ring is bounded, so a client that falls more than 200
+# entries behind skips the oldest ones (and is told so) instead of buffering.
 _log_buffer: deque = deque(maxlen=200)
+_log_cursor = 0
+_log_lock = threading.Lock()  # keeps seq numbers and ring order in step
+_log_event: asyncio.Event | None = None
+_log_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _wake_log_clients():
+    """Release every SSE client waiting for new entries (runs on the loop)."""
+    global _log_event
+    event, _log_event = _log_event, asyncio.Event()
+    event.set()
 
 
 class SSELogHandler(logging.Handler):
     """Broadcasts log records to SSE clients for live streaming."""
 
     def emit(self, record):
+        global _log_cursor
         try:
-            entry = {
-                "ts": datetime.fromtimestamp(record.created).strftime("%H:%M:%S.%f")[:-3],
+            # Encoded straight to the wire frame; the buffer only ever holds
+            # bytes, never a per-record dict, and each client just copies it
+            ts = "%s.%03d" % (time.strftime("%H:%M:%S", time.localtime(record.created)), record.msecs)
+            frame = b"data: " + orjson.dumps({
+                "ts": ts,
                 "level": record.levelname,
                 "name": record.name[:20],
                 "msg": record.getMessage(),
-            }
-            _log_buffer.append(entry)
-            for q in list(_log_clients):
-                try:
-                    q.put_nowait(entry)
-                except Exception:
-                    pass
+            }) + b"\n\n"
+            with _log_lock:
+                _log_cursor += 1
+                _log_buffer.append((_log_cursor, frame))
+            # Runs on the listener thread — the wake-up must happen on the loop
+            if _log_loop is not None:
+                _log_loop.call_soon_threadsafe(_wake_log_clients)
         except Exception:
             pass
 
 
-logging.getLogger().addHandler(SSELogHandler())
+_console_handler = logging.StreamHandler()
+_console_handler.setFormatter(logging.Formatter(
+    "%(asctime)s │ %(levelname)-7s │ %(name)-15s │ %(message)s",
+    datefmt="%H:%M:%S",
+))
+# uvicorn loggers already print to the console; only mirror them to SSE
+_console_handler.addFilter(lambda record: not record.name.startswith("uvicorn"))
+
+_log_listener = QueueListener(
+    _log_queue, _console_handler, SSELogHandler(), respect_handler_level=True
+)
+# One listener for the life of the process, not per lifespan: the queue
+# handlers outlive any single app, so the drain has to as well. atexit
+# flushes whatever is still queued on the way out.
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+
+def _capture_uvicorn_logs() -> None:
+    """Also capture uvicorn access/server logs in the SSE stream.
+
+    Idempotent. uvicorn applies its own logging dictConfig when handed an
+    app object (after this module is imported), which replaces these
+    loggers' handlers, so lifespan calls this again once that has happened.
+    """
+    for name in ("uvicorn", "uvicorn.access", "uvicorn.error"):
+        uv_logger = logging.getLogger(name)
+        if not any(isinstance(h, QueueHandler) and h.queue is _log_queue for h in uv_logger.handlers):
+            uv_logger.addHandler(QueueHandler(_log_queue))
+
+
+_capture_uvicorn_logs()
+
+
+# ── Internet Status ──
+# Probed by a background task so /health never waits on the network.
+INTERNET_POLL_INTERVAL = 10
+# /health probes itself only when the poller has fallen this far behind
+INTERNET_TTL = INTERNET_POLL_INTERVAL * 2
+_internet_ok: bool | None = None
+_internet_checked_at = 0.0  # time.monotonic()
+_internet_lock = asyncio.Lock()
+
+
+async def _refresh_internet() -> bool:
+    """Probe connectivity off the event loop and store the result."""
+    global _internet_ok, _internet_checked_at
+    _internet_ok = await asyncio.to_thread(check_internet)
+    _internet_checked_at = time.monotonic()
+    return _internet_ok
 
-# Also capture uvicorn access logs in the SSE stream
-for _uv_name in ("uvicorn", "uvicorn.access", "uvicorn.error"):
-    _uv_logger = logging.getLogger(_uv_name)
-    _uv_logger.addHandler(SSELogHandler())
+
+async def _current_internet() -> bool:
+    """Last known connectivity, re-probed only if missing or stale."""
+    if _internet_ok is None or time.monotonic() - _internet_checked_at > INTERNET_TTL:
+        # One probe at a time; callers queued behind it reuse its result
+        async with _internet_lock:
+            if _internet_ok is None or time.monotonic() - _internet_checked_at > INTERNET_TTL:
+                await _refresh_internet()
+    return _internet_ok
+
+
+async def _internet_poller():
+    """Keep _internet_ok fresh for the lifetime of the server."""
+    while True:
+        await _refresh_internet()
+        await asyncio.sleep(INTERNET_POLL_INTERVAL)
 
 
 @asynccontextmanager
 async def lifespan(application: FastAPI):
     """Startup and shutdown."""
     global startup_time
-    startup_time = datetime.now()
+    startup_time = time.monotonic()
+    _capture_uvicorn_logs()
 
     logger.info("=" * 60)
     logger.info("  UNIFIED API SERVER v1.0")
@@ -77,162 +172,168 @@ async def lifespan(application: FastAPI):
     logger.info(f"  Debug: {Config.DEBUG}")
     logger.info("=" * 60)
 
+    poller = asyncio.create_task(_internet_poller())
+    # Pay the route/model introspection and the tester read before the
+    # first request does
+    _api_info_json()
+    _tester_html()
+
     yield
 
     logger.info("Server shutting down...")
+    poller.cancel()
+    with suppress(asyncio.CancelledError):
+        await poller
 
 
-app = FastAPI(
-    title="Unified API Server",
-    version="1.0.0",
-    docs_url=None,
-    redoc_url=None,
-    openapi_url=None,
-    lifespan=lifespan,
-)
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=False,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Server-level endpoints; create_app() mounts them next to the service routers
+router = APIRouter()
 
-# Auto-load all service routers
-for router in load_service_routers():
-    app.include_router(router)
+# Filled in by create_app() — the service set is frozen once loading is done
+_service_info: dict = {}
 
 
-def _extract_body_fields(route) -> dict:
-    """Extract request body fields with defaults from a FastAPI route."""
-    try:
-        dependant = getattr(route, "dependant", None)
-        if not dependant or not dependant.body_params:
-            return None
-        param = dependant.body_params[0]
-        model_class = param.field_info.annotation
-        if not hasattr(model_class, "model_fields"):
-            return None
-        fields = {}
-        for field_name, field_info in model_class.model_fields.items():
-            default = field_info.default
-            if default is ...:
-                fields[field_name] = None
-            elif default is None:
-                fields[field_name] = None
-            elif isinstance(default, bool):
-                fields[field_name] = default
-            elif isinstance(default, (int, float)):
-                fields[field_name] = default
-            elif isinstance(default, str):
-                fields[field_name] = default
-            elif hasattr(default, "value"):
-                fields[field_name] = default.value
-            else:
-                fields[field_name] = str(default)
-        return fields
-    except Exception:
+def _body_model(route):
+    """Return the Pydantic model class of a route's request body, if any."""
+    dependant = getattr(route, "dependant", None)
+    if not dependant or not dependant.body_params:
+        return None
+    model_class = dependant.body_params[0].field_info.annotation
+    if not hasattr(model_class, "model_fields"):
         return None
+    return model_class
 
 
-def _extract_field_info(route) -> list:
-    """Extract detailed field metadata for documentation."""
+def _extract_field_info(route) -> tuple[MappingProxyType, tuple]:
+    """Extract body defaults and detailed field metadata for documentation."""
     try:
-        dependant = getattr(route, "dependant", None)
-        if not dependant or not dependant.body_params:
-            return None
-        param = dependant.body_params[0]
-        model_class = param.field_info.annotation
-        if not hasattr(model_class, "model_fields"):
-            return None
-
-        fields_info = []
-        for field_name, field_info in model_class.model_fields.items():
-            # Determine type string
-            annotation = field_info.annotation
-            type_str = "any"
-            if annotation is not None:
-                origin = getattr(annotation, "__origin__", None)
-                if annotation is str or annotation is type(None):
-                    type_str = "string"
-                elif annotation is int:
-                    type_str = "integer"
-                elif annotation is float:
-                    type_str = "number"
-                elif annotation is bool:
-                    type_str = "boolean"
-                elif hasattr(annotation, "__members__"):
-                    # Enum
-                    type_str = "enum: " + ", ".join(f'"{v.value}"' for v in annotation)
-                elif origin is not None:
-                    args = getattr(annotation, "__args__", ())
-                    # Handle Optional[X] = Union[X, None]
-                    non_none = [a for a in args if a is not type(None)]
-                    if non_none:
-                        inner = non_none[0]
-                        if inner is str:
-                            type_str = "string"
-                        elif inner is int:
-                            type_str = "integer"
-                        elif inner is float:
-                            type_str = "number"
-                        elif inner is bool:
-                            type_str = "boolean"
-                        elif hasattr(inner, "__members__"):
-                            type_str = "enum: " + ", ".join(f'"{v.value}"' for v in inner)
-                        elif hasattr(inner, "__origin__"):
-                            # e.g. List[str]
-                            type_str = "array"
-                        elif hasattr(inner, "__name__") and inner.__name__ == "Url":
-                            type_str = "string (URL)"
-                        else:
-                            type_str = getattr(inner, "__name__", str(inner))
-
-            # Default value
-            default = field_info.default
-            if default is ...:
-                default_val = None
-            elif default is None:
-                default_val = None
-            elif isinstance(default, bool):
-                default_val = default
-            elif isinstance(default, (int, float)):
-                default_val = default
-            elif hasattr(default, "value"):
-                default_val = default.value
-            else:
-                default_val = str(default)
-
-            required = field_info.default is ...
-
-            fields_info.append({
-                "name": field_name,
-                "type": type_str,
-                "default": default_val,
-                "required": required,
-            })
-        return fields_info
+        model_class = _body_model(route)
+        if model_class is None:
+            return None, None
+        return _fields_info_for_model(model_class)
     except Exception:
-        return None
-
-
-@app.get("/api")
-async def api_info():
-    """API info and loaded services."""
-    service_info = get_loaded_services()
+        return None, None
+
+
+def _annotate_routes(routes) -> None:
+    """Attach each route's body/field docs once, when its router is included."""
+    for route in routes:
+        route._cached_body_fields, route._cached_fields_info = _extract_field_info(route)
+
+
+# Type names shown in /api field docs, keyed on the annotation itself
+_TYPE_MAP = {
+    str: "string",
+    int: "integer",
+    float: "number",
+    bool: "boolean",
+    type(None): "string",
+}
+
+
+def _enum_str(enum_cls) -> str:
+    """List an Enum's values for the docs."""
+    return "enum: " + ", ".join(f'"{v.value}"' for v in enum_cls)
+
+
+def _plain_type_str(tp) -> str | None:
+    """Name a non-generic type: one _TYPE_MAP lookup, then the Enum check."""
+    type_str = _TYPE_MAP.get(tp)
+    if type_str is None and isinstance(tp, EnumMeta):
+        type_str = _enum_str(tp)
+    return type_str
+
+
+def _type_str(annotation) -> str:
+    """Describe a field annotation; plain types hit _TYPE_MAP directly."""
+    type_str = _plain_type_str(annotation)
+    if type_str is not None:
+        return type_str
+    if get_origin(annotation) is None:
+        return "any"
+    # Handle Optional[X] = Union[X, None] (and X | None)
+    non_none = [a for a in get_args(annotation) if a is not type(None)]
+    if not non_none:
+        return "any"
+    inner = non_none[0]
+    type_str = _plain_type_str(inner)
+    if type_str is not None:
+        return type_str
+    if get_origin(inner) is not None:
+        # e.g. List[str]
+        return "array"
+    name = getattr(inner, "__name__", None)
+    if name == "Url":
+        return "string (URL)"
+    return name or str(inner)
+
+
+@functools.lru_cache(maxsize=None)
+def _fields_info_for_model(model_class) -> tuple[MappingProxyType, tuple]:
+    """Body defaults and field metadata for a model class, in one pass.
+
+    Cached — models never change. The body schema is just the name/default
+    projection of the field list, so both come out of the same walk. The
+    results are shared by every route using the model, hence read-only.
+    """
+    body_fields = {}
+    fields_info = []
+    for field_name, field_info in model_class.model_fields.items():
+        annotation = field_info.annotation
+        type_str = _type_str(annotation) if annotation is not None else "any"
+
+        # Default value
+        default = field_info.default
+        if default is ... or default is None:
+            default_val = None
+        elif isinstance(default, (bool, int, float, str)):
+            default_val = default
+        elif hasattr(default, "value"):
+            default_val = default.value
+        else:
+            default_val = str(default)
+
+        body_fields[field_name] = default_val
+        fields_info.append(MappingProxyType({
+            "name": field_name,
+            "type": type_str,
+            "default": default_val,
+            "required": default is ...,
+        }))
+    return MappingProxyType(body_fields), tuple(fields_info)
+
+
+# Serialized on first /api hit — routers are fixed once the auto-loader has run
+_api_info_bytes: bytes | None = None
+
+# Implicit methods Starlette adds to every route; never worth documenting
+_HIDDEN_METHODS = frozenset({"HEAD", "OPTIONS"})
+
+
+def _build_api_info() -> dict:
+    """Walk every loaded service router and build the /api payload."""
     services = {}
-    for name, info in service_info["services"].items():
+    for name, info in _service_info["services"].items():
         router = info["router"]
-        prefix = info["prefix"]
+        # Auto-loaded docs (from service docs.py) are shared by every endpoint,
+        # so build that block once per service and reference it from each
+        svc_docs = info.get("docs")
+        docs_fields = {}
+        if svc_docs:
+            docs_fields["use_cases"] = svc_docs.get("examples", ())
+            docs_fields["notes"] = svc_docs.get("notes", ())
+            if svc_docs.get("code_examples"):
+                docs_fields["code_examples"] = svc_docs["code_examples"]
         endpoints = []
         for route in router.routes:
             if not getattr(route, "include_in_schema", True):
                 continue
-            methods = sorted(route.methods - {"HEAD", "OPTIONS"}) if hasattr(route, "methods") else []
+            methods = tuple(sorted(route.methods - _HIDDEN_METHODS)) if hasattr(route, "methods") else ()
             if methods:
-                body_fields = _extract_body_fields(route)
-                fields_info = _extract_field_info(route)
+                if hasattr(route, "_cached_fields_info"):
+                    body_fields, fields_info = route._cached_body_fields, route._cached_fields_info
+                else:
+                    body_fields, fields_info = _extract_field_info(route)
                 desc = route.description or ""
                 # Clean up docstring: take just the first meaningful paragraph
                 if desc:
@@ -247,16 +348,10 @@ async def api_info():
                     ep["body_schema"] = body_fields
                 if fields_info is not None:
                     ep["fields"] = fields_info
-                # Attach auto-loaded docs (from service docs.py)
-                svc_docs = info.get("docs")
-                if svc_docs:
-                    ep["use_cases"] = svc_docs.get("examples", [])
-                    ep["notes"] = svc_docs.get("notes", [])
-                    if svc_docs.get("code_examples"):
-                        ep["code_examples"] = svc_docs["code_examples"]
+                ep.update(docs_fields)
                 endpoints.append(ep)
         services[name] = {
-            "prefix": prefix,
+            "prefix": info["prefix"],
             "routes": len(endpoints),
             "endpoints": endpoints,
         }
@@ -268,59 +363,101 @@ async def api_info():
     }
 
 
-@app.get("/health")
+def _api_info_json() -> bytes:
+    """The serialized /api payload, built on first use."""
+    global _api_info_bytes
+    if _api_info_bytes is None:
+        # default=dict covers the read-only field mappings
+        _api_info_bytes = orjson.dumps(_build_api_info(), default=dict)
+    return _api_info_bytes
+
+
+@router.get("/api")
+async def api_info():
+    """API info and loaded services."""
+    # Already JSON — skip the response-model encode on every hit
+    return Response(_api_info_json(), media_type="application/json")
+
+
+@router.get("/health")
 async def health():
     """Health check."""
-    uptime = (datetime.now() - startup_time).total_seconds() if startup_time else 0
-    internet_ok = await asyncio.to_thread(check_internet)
-    service_info = get_loaded_services()
+    uptime = time.monotonic() - startup_time if startup_time else 0
+    # Normally fresh from the poller; probes only without lifespan (e.g. a
+    # bare TestClient) or if the poller has stalled
+    internet_ok = await _current_internet()
     return {
         "status": "healthy" if internet_ok else "degraded",
         "version": "1.0.0",
         "uptime": round(uptime, 2),
         "internet": internet_ok,
-        "services_loaded": service_info["total_services"],
-        "services_failed": service_info["failed_services"],
-        "services": {name: "operational" for name in service_info["services"]},
+        "services_loaded": _service_info["total_services"],
+        "services_failed": _service_info["failed_services"],
+        "services": _service_info["operational"],
     }
 
 
 STATIC_DIR = Path(__file__).parent / "static"
 
 
-@app.get("/")
-async def api_tester():
+# tester.html is a static asset — read and hash it once, then serve from memory
+_tester_page: tuple[bytes, str] | None = None
+
+
+def _tester_html() -> tuple[bytes, str]:
+    """tester.html and its quoted ETag, read on first use."""
+    global _tester_page
+    if _tester_page is None:
+        html = (STATIC_DIR / "tester.html").read_bytes()
+        _tester_page = (html, f'"{hashlib.blake2s(html, digest_size=8).hexdigest()}"')
+    return _tester_page
+
+
+@router.get("/")
+async def api_tester(request: Request):
     """Built-in API tester web UI."""
-    return FileResponse(STATIC_DIR / "tester.html", media_type="text/html")
+    html, etag = _tester_html()
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=3600"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=html, media_type="text/html", headers=headers)
 
 
-@app.get("/favicon.ico", include_in_schema=False)
+@router.get("/favicon.ico", include_in_schema=False)
 async def favicon():
     """Serve favicon."""
     return FileResponse(STATIC_DIR / "favicon.ico", media_type="image/x-icon")
 
 
-@app.get("/logs/stream")
+@router.get("/logs/stream")
 async def log_stream():
     """SSE endpoint for live server log streaming."""
-    client_queue: asyncio.Queue = asyncio.Queue(maxsize=500)
-    _log_clients.append(client_queue)
+    global _log_loop, _log_event
+    _log_loop = asyncio.get_running_loop()
+    if _log_event is None:
+        _log_event = asyncio.Event()
 
     async def generate():
+        last_seen = 0
         try:
-            for entry in list(_log_buffer):
-                yield f"data: {json.dumps(entry)}\n\n"
             while True:
+                # Grab the event before scanning so no append can slip past
+                event = _log_event
+                with _log_lock:
+                    pending = [item for item in _log_buffer if item[0] > last_seen]
+                if pending:
+                    dropped = pending[0][0] - last_seen - 1
+                    if last_seen and dropped > 0:
+                        yield b": %d log entries dropped\n\n" % dropped
+                    last_seen = pending[-1][0]
+                    # One chunk per wake-up; the backlog replay is a single write
+                    yield b"".join(frame for _, frame in pending)
                 try:
-                    entry = await asyncio.wait_for(client_queue.get(), timeout=30)
-                    yield f"data: {json.dumps(entry)}\n\n"
+                    await asyncio.wait_for(event.wait(), timeout=30)
                 except asyncio.TimeoutError:
-                    yield ": keepalive\n\n"
+                    yield b": keepalive\n\n"
         except asyncio.CancelledError:
             pass
-        finally:
-            if client_queue in _log_clients:
-                _log_clients.remove(client_queue)
 
     return StreamingResponse(
         generate(),
@@ -332,7 +469,7 @@ async def log_stream():
 # ── External API Proxy ──
 # Allows the tester UI to send requests to any external URL without CORS issues.
 
-@app.api_route("/proxy", methods=["GET", "POST", "PUT", "PATCH", "DELETE"], include_in_schema=False)
+@router.api_route("/proxy", methods=["GET", "POST", "PUT", "PATCH", "DELETE"], include_in_schema=False)
 async def proxy_request(request: Request):
     """Forward a request to an external URL (bypasses CORS for the tester UI)."""
     target_url = request.query_params.get("url")
@@ -380,25 +517,86 @@ async def proxy_request(request: Request):
             media_type=resp.headers.get("content-type"),
         )
     except httpx.TimeoutException:
-        return Response(
-            content=json.dumps({"error": "Proxy request timed out after 120s", "url": target_url}),
+        return ORJSONResponse(
+            {"error": "Proxy request timed out after 120s", "url": target_url},
             status_code=504,
-            media_type="application/json",
         )
     except httpx.RequestError as exc:
-        return Response(
-            content=json.dumps({"error": f"Proxy connection failed: {exc}", "url": target_url}),
+        return ORJSONResponse(
+            {"error": f"Proxy connection failed: {exc}", "url": target_url},
             status_code=502,
-            media_type="application/json",
         )
 
 
+async def _http_exception_handler(request: Request, exc: StarletteHTTPException) -> Response:
+    """FastAPI's HTTPException handler, rendered with orjson.
+
+    default_response_class doesn't reach exception handlers, so without this
+    every service error body (HTTPException(detail={...})) goes through json.
+    """
+    headers = getattr(exc, "headers", None)
+    if not is_body_allowed_for_status_code(exc.status_code):
+        return Response(status_code=exc.status_code, headers=headers)
+    return ORJSONResponse({"detail": exc.detail}, status_code=exc.status_code, headers=headers)
+
+
+def create_app() -> FastAPI:
+    """Build the FastAPI app: server endpoints plus every auto-loaded service."""
+    global _service_info
+
+    application = FastAPI(
+        title="Unified API Server",
+        version="1.0.0",
+        docs_url=None,
+        redoc_url=None,
+        openapi_url=None,
+        default_response_class=ORJSONResponse,
+        exception_handlers={StarletteHTTPException: _http_exception_handler},
+        lifespan=lifespan,
+    )
+
+    application.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=False,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    application.include_router(router)
+
+    # Auto-load all service routers
+    for service_router in load_service_routers():
+        application.include_router(service_router)
+        _annotate_routes(service_router.routes)
+
+    # Snapshot for /health and /api
+    _service_info = get_loaded_services()
+
+    return application
+
+
+# With reload on, neither the supervisor (__main__) nor spawn's re-import of
+# this script (__mp_main__) serves requests — only the worker's "main" import
+# needs an app, so skip loading every service three times over.
+_reloader_process = __name__ == "__mp_main__" or (__name__ == "__main__" and Config.DEBUG)
+app = None if _reloader_process else create_app()
+
+
+# Dev reloader: only *.py changes trigger a reload (uvicorn's default include),
+# and excludes are only tested on paths that matched it — so media suffix
+# globs never filter anything. Just keep the runtime data directories out.
+RELOAD_EXCLUDES = ["cache/*", "downloads/*"]
+
+
 if __name__ == "__main__":
     uvicorn.run(
-        "main:app",
+        # Reload needs an import string; otherwise serve this module's app so
+        # main.py isn't imported a second time (loggers, services, SSE state)
+        "main:app" if Config.DEBUG else app,
         host=Config.HOST,
         port=Config.PORT,
         reload=Config.DEBUG,
-        reload_excludes=["cache/*", "downloads/*", "*.mp4", "*.webm", "*.mp3", "*.m4a", "*.opus", "*.wav", "*.part", "*.ytdl"] if Config.DEBUG else None,
+        reload_excludes=RELOAD_EXCLUDES if Config.DEBUG else None,
         timeout_keep_alive=300,
     )
@@ -5,8 +5,11 @@ Drop a service folder into services/ with an endpoints.py exporting 'router'.
 
 import importlib
 import logging
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from types import MappingProxyType
+from typing import List, Dict, Any, Mapping, Optional
 from fastapi import APIRouter
 
 logger = logging.getLogger(__name__)
@@ -15,77 +18,96 @@ logger = logging.getLogger(__name__)
 class ServiceLoader:
     """Service auto-loader with discovery and validation."""
     
+    __slots__ = ('services_dir', 'loaded_services', 'failed_services', '_operational_map')
+    
     def __init__(self):
         self.services_dir = Path(__file__).parent
         self.loaded_services: Dict[str, Dict[str, Any]] = {}
         self.failed_services: Dict[str, str] = {}
+        # Status map served by /health; rebuilt only when a load pass finishes
+        self._operational_map: Mapping[str, str] = MappingProxyType({})
     
     def discover_services(self) -> List[Path]:
         """Discover all valid service directories."""
         service_folders = []
         
         if not self.services_dir.exists():
-            logger.warning(f"Services directory not found: {self.services_dir}")
+            logger.warning("Services directory not found: %s", self.services_dir)
             return service_folders
         
-        for item in self.services_dir.iterdir():
-            # Skip special folders and files
-            if item.name.startswith('_') or item.name.startswith('.'):
-                continue
-            
-            # Must be a directory
-            if not item.is_dir():
-                continue
-            
-            # Must have endpoints.py
-            endpoints_file = item / 'endpoints.py'
-            if not endpoints_file.exists():
-                logger.debug(f"Skipping {item.name}: No endpoints.py found")
-                continue
-            
-            service_folders.append(item)
-            logger.debug(f"Discovered service candidate: {item.name}")
+        # scandir hands back the dirent type, so is_dir() costs no extra stat
+        with os.scandir(self.services_dir) as entries:
+            for entry in entries:
+                # Skip special folders and files
+                if entry.name[:1] in ('_', '.'):
+                    continue
+                
+                # Must be a directory
+                if not entry.is_dir():
+                    continue
+                
+                # Must have endpoints.py
+                if not os.path.isfile(os.path.join(entry.path, 'endpoints.py')):
+                    logger.debug("Skipping %s: No endpoints.py found", entry.name)
+                    continue
+                
+                service_folders.append(Path(entry.path))
+                logger.debug("Discovered service candidate: %s", entry.name)
         
         return service_folders
     
-    def _load_docs(self, service_name: str) -> Optional[Dict[str, Any]]:
+    def _load_docs(self, service_name: str) -> Optional[Mapping[str, Any]]:
         """Auto-load docs.py from a service folder (NOTES + EXAMPLES)."""
         try:
             docs_module = importlib.import_module(f"services.{service_name}.docs")
-            notes = getattr(docs_module, 'NOTES', [])
-            examples = getattr(docs_module, 'EXAMPLES', [])
+            notes = getattr(docs_module, 'NOTES', ())
+            examples = getattr(docs_module, 'EXAMPLES', ())
             code_examples = getattr(docs_module, 'CODE_EXAMPLES', None)
             if notes or examples or code_examples:
-                logger.debug(f"  docs: {len(examples)} examples, {len(notes)} notes")
+                logger.debug("  docs: %d examples, %d notes", len(examples), len(notes))
                 result = {'notes': notes, 'examples': examples}
                 if code_examples:
                     result['code_examples'] = code_examples
-                return result
+                # Static module data, shared with /api — keep it read-only
+                return MappingProxyType(result)
         except ModuleNotFoundError:
             pass  # No docs.py — that's fine
         except Exception as e:
-            logger.warning(f"  docs.py error in {service_name}: {e}")
+            logger.warning("  docs.py error in %s: %s", service_name, e)
         return None
     
-    def load_service(self, service_path: Path) -> Optional[APIRouter]:
-        """Load a single service and return its router."""
+    def _import_service(self, service_name: str):
+        """Import a service package, run its setup(), return its endpoints module."""
+        # discover_services() only lists folders that have an endpoints.py
+        module_path = f"services.{service_name}.endpoints"
+        
+        # Import service package and call setup() if defined
+        service_pkg = importlib.import_module(f"services.{service_name}")
+        if hasattr(service_pkg, 'setup'):
+            service_pkg.setup()
+        
+        # Import the endpoints module
+        logger.debug("Importing %s...", module_path)
+        return importlib.import_module(module_path)
+    
+    def load_service(self, service_path: Path, pending: Optional[Future] = None) -> Optional[APIRouter]:
+        """Load a single service and return its router.
+        
+        ``pending`` is an already-submitted _import_service() call; its
+        result (or exception) is used instead of importing here.
+        """
         service_name = service_path.name
         
         try:
-            # Import service package and call setup() if defined
-            service_pkg = importlib.import_module(f"services.{service_name}")
-            if hasattr(service_pkg, 'setup'):
-                service_pkg.setup()
-            
-            # Import the endpoints module
-            module_path = f"services.{service_name}.endpoints"
-            logger.debug(f"Importing {module_path}...")
-            module = importlib.import_module(module_path)
+            if pending is not None:
+                module = pending.result()
+            else:
+                module = self._import_service(service_name)
             
             # Validate router exists
             if not hasattr(module, 'router'):
                 error_msg = "No 'router' variable found in endpoints.py"
-                logger.error(f"✗ {service_name}: {error_msg}")
+                logger.error("✗ %s: %s", service_name, error_msg)
                 self.failed_services[service_name] = error_msg
                 return None
             
@@ -94,7 +116,7 @@ class ServiceLoader:
             # Validate it's actually a router
             if not isinstance(router, APIRouter):
                 error_msg = "'router' is not a FastAPI APIRouter instance"
-                logger.error(f"✗ {service_name}: {error_msg}")
+                logger.error("✗ %s: %s", service_name, error_msg)
                 self.failed_services[service_name] = error_msg
                 return None
             
@@ -102,8 +124,8 @@ class ServiceLoader:
             prefix = getattr(router, 'prefix', '/')
             tags = getattr(router, 'tags', [])
             
-            # Count routes
-            route_count = len(router.routes)
+            # Count advertised routes (hidden admin routes stay out of listings)
+            route_count = sum(1 for r in router.routes if getattr(r, 'include_in_schema', True))
             
             # Store service info
             self.loaded_services[service_name] = {
@@ -116,18 +138,18 @@ class ServiceLoader:
                 'docs': self._load_docs(service_name),
             }
             
-            logger.info(f"✓ {service_name:<15} │ {prefix:<20} │ {route_count} routes │ {tags}")
+            logger.info("✓ %-15s │ %-20s │ %d routes │ %s", service_name, prefix, route_count, tags)
             return router
         
         except ImportError as e:
             error_msg = f"Import failed: {str(e)}"
-            logger.error(f"✗ {service_name}: {error_msg}")
+            logger.error("✗ %s: %s", service_name, error_msg)
             self.failed_services[service_name] = error_msg
             return None
         
         except Exception as e:
             error_msg = f"Unexpected error: {str(e)}"
-            logger.error(f"✗ {service_name}: {error_msg}", exc_info=True)
+            logger.error("✗ %s: %s", service_name, error_msg, exc_info=True)
             self.failed_services[service_name] = error_msg
             return None
     
@@ -144,25 +166,34 @@ class ServiceLoader:
             logger.warning("No services found in services/ directory")
             return []
         
-        logger.info(f"Found {len(service_paths)} service(s) to load")
+        logger.info("Found %d service(s) to load", len(service_paths))
         logger.info("-" * 80)
-        logger.info(f"{'SERVICE':<15} │ {'ENDPOINT PREFIX':<20} │ {'INFO'}")
+        logger.info("%-15s │ %-20s │ %s", "SERVICE", "ENDPOINT PREFIX", "INFO")
         logger.info("-" * 80)
         
-        # Load each service
+        # Import (and set up) services concurrently — setup() may hit the
+        # disk or network — then register them one by one, in name order,
+        # so the table below and the router order stay deterministic
+        service_paths = sorted(service_paths)
         routers = []
-        for service_path in sorted(service_paths):
-            router = self.load_service(service_path)
-            if router:
-                routers.append(router)
+        with ThreadPoolExecutor(max_workers=min(8, len(service_paths))) as pool:
+            pending = [pool.submit(self._import_service, path.name) for path in service_paths]
+            for service_path, future in zip(service_paths, pending):
+                router = self.load_service(service_path, future)
+                if router:
+                    routers.append(router)
+        
+        self._operational_map = MappingProxyType(
+            {name: 'operational' for name in self.loaded_services}
+        )
         
         logger.info("-" * 80)
-        logger.info(f"✓ Successfully loaded: {len(routers)}/{len(service_paths)} services")
+        logger.info("✓ Successfully loaded: %d/%d services", len(routers), len(service_paths))
         
         if self.failed_services:
-            logger.warning(f"✗ Failed to load: {len(self.failed_services)} service(s)")
+            logger.warning("✗ Failed to load: %d service(s)", len(self.failed_services))
             for service_name, error in self.failed_services.items():
-                logger.warning(f"  - {service_name}: {error}")
+                logger.warning("  - %s: %s", service_name, error)
         
         logger.info("=" * 80)
         
@@ -174,7 +205,8 @@ class ServiceLoader:
             'total_services': len(self.loaded_services),
             'failed_services': len(self.failed_services),
             'services': self.loaded_services,
-            'failures': self.failed_services
+            'failures': self.failed_services,
+            'operational': self._operational_map,
         }
 
 
@@ -1,48 +1,210 @@
 """TTS cache manager."""
 
+import asyncio
 import hashlib
 import logging
-from typing import Optional
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import AsyncIterator, Callable, Optional, Tuple, Union
 
 from . import config
 
 logger = logging.getLogger(__name__)
 
+# Normalized request identity: (voice, rate, pitch, volume, text) — the long
+# text goes last so tuple comparisons settle on the short fields first
+TTSKey = Tuple[str, str, str, str, str]
+
 
 class TTSCache:
-    """Manages TTS audio caching."""
+    """Manages TTS audio caching.
+
+    Disk files under CACHE_DIR are the source of truth; hot entries are also
+    kept in a byte-bounded in-memory LRU so repeat requests skip the disk.
+    """
+
+    __slots__ = ("_mem", "_mem_bytes", "_lock", "_inflight", "_tasks")
 
     def __init__(self):
-        pass
+        # Keyed on (CACHE_DIR, digest): a different CACHE_DIR never hits, and
+        # a memory hit needs no Path building
+        self._mem: OrderedDict[tuple, bytes] = OrderedDict()
+        self._mem_bytes = 0
+        self._lock = threading.Lock()
+        # Syntheses in progress, by (loop, cache key); identical misses await these
+        self._inflight: dict[tuple, asyncio.Future] = {}
+        # Running synthesis tasks; the loop only holds weak references
+        self._tasks: set[asyncio.Task] = set()
+
+    def _mem_get(self, key: tuple) -> Optional[bytes]:
+        with self._lock:
+            audio = self._mem.get(key)
+            if audio is not None:
+                self._mem.move_to_end(key)
+            return audio
+
+    def _mem_put(self, key: tuple, audio: bytes) -> None:
+        if len(audio) > config.MEM_CACHE_MAX_BYTES:
+            return
+        with self._lock:
+            old = self._mem.pop(key, None)
+            if old is not None:
+                self._mem_bytes -= len(old)
+            self._mem[key] = audio
+            self._mem_bytes += len(audio)
+            while self._mem_bytes > config.MEM_CACHE_MAX_BYTES:
+                _, evicted = self._mem.popitem(last=False)
+                self._mem_bytes -= len(evicted)
 
-    def _get_cache_key(self, text: str, voice: str, rate: str, pitch: str, volume: str) -> str:
-        """Generate unique cache key using MD5 hash."""
-        content = f"{voice}:{rate}:{pitch}:{volume}:{text}"
-        return hashlib.md5(content.encode('utf-8')).hexdigest()
+    def _get_cache_key(self, key: TTSKey) -> str:
+        """Generate unique cache key (SHA-256, truncated to 32 hex chars).
 
-    def get(self, text: str, voice: str, rate: str, pitch: str, volume: str) -> Optional[bytes]:
-        """Get cached audio if exists."""
+        SHA-256 runs on the CPU's SHA extensions via OpenSSL, which makes it
+        faster than MD5 on long texts.
+        """
+        voice, rate, pitch, volume, text = key
+        # Feed the short params and the (up to MAX_TEXT_LENGTH) text separately
+        # so the text is never copied into one big concatenated string
+        h = hashlib.sha256(f"{voice}:{rate}:{pitch}:{volume}:".encode('utf-8'))
+        h.update(text.encode('utf-8'))
+        return h.hexdigest()[:32]
+
+    @staticmethod
+    def _write_file(cache_path: Path, audio: bytes) -> None:
+        """Write via a temp file + rename so readers never see a partial MP3."""
+        if cache_path.exists():
+            return  # A concurrent request already stored the same audio
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.urandom(4).hex()}.tmp")
+        try:
+            tmp_path.write_bytes(audio)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    async def _read(self, cache_key: str) -> Optional[bytes]:
+        """Look up audio by hashed key: memory first, then disk (off the loop)."""
         if not config.CACHE_ENABLED:
             return None
 
-        cache_key = self._get_cache_key(text, voice, rate, pitch, volume)
-        cache_path = config.CACHE_DIR / f"{cache_key}.mp3"
+        mem_key = (config.CACHE_DIR, cache_key)
+        audio = self._mem_get(mem_key)
+        if audio is not None:
+            logger.debug("Cache HIT (memory): %s...", cache_key[:8])
+            return audio
 
-        if cache_path.exists():
-            logger.debug(f"Cache HIT: {cache_key[:8]}...")
-            return cache_path.read_bytes()
+        cache_path = mem_key[0] / f"{cache_key}.mp3"
+        try:
+            audio = await asyncio.to_thread(cache_path.read_bytes)
+        except FileNotFoundError:
+            return None
 
-        return None
+        logger.debug("Cache HIT: %s...", cache_key[:8])
+        self._mem_put(mem_key, audio)
+        return audio
 
-    def set(self, text: str, voice: str, rate: str, pitch: str, volume: str, audio: bytes) -> None:
-        """Cache audio data."""
+    async def _store(self, cache_key: str, audio: bytes) -> None:
+        """Store audio by hashed key on disk (off the loop) and in memory."""
         if not config.CACHE_ENABLED:
             return
 
-        cache_key = self._get_cache_key(text, voice, rate, pitch, volume)
-        cache_path = config.CACHE_DIR / f"{cache_key}.mp3"
-        cache_path.write_bytes(audio)
-        logger.debug(f"Cache SET: {cache_key[:8]}... ({len(audio)} bytes)")
+        cache_dir = config.CACHE_DIR
+        await asyncio.to_thread(self._write_file, cache_dir / f"{cache_key}.mp3", audio)
+        self._mem_put((cache_dir, cache_key), audio)
+        logger.debug("Cache SET: %s... (%d bytes)", cache_key[:8], len(audio))
+
+    def _join_inflight(self, cache_key: str):
+        """Return ``(slot, future, leader)`` for this request's synthesis.
+
+        The first caller for a key registers a new future and is the leader;
+        later callers get the leader's future to await.
+        """
+        # Futures belong to one event loop, so only share within the caller's
+        loop = asyncio.get_running_loop()
+        slot = (loop, cache_key)
+        pending = self._inflight.get(slot)
+        if pending is not None:
+            return slot, pending, False
+        future = loop.create_future()
+        self._inflight[slot] = future
+        return slot, future, True
+
+    def _settle(self, slot: tuple, future: asyncio.Future, audio: Optional[bytes] = None,
+                error: Optional[BaseException] = None) -> None:
+        """Resolve a leader's future for its followers and drop it from _inflight."""
+        del self._inflight[slot]
+        if error is None:
+            future.set_result(audio)
+            return
+        future.set_exception(error)
+        future.exception()  # Mark retrieved; followers (if any) re-raise it
+
+    async def get_or_stream(
+        self, key: TTSKey, producer: Callable[[], AsyncIterator[bytes]],
+    ) -> Tuple[str, Union[bytes, AsyncIterator[bytes]]]:
+        """Return cached audio, or produce it once for all concurrent callers.
+
+        Returns ``(cache_key, audio)``. ``audio`` is the full audio when it
+        already exists (cached, or finished by an identical in-flight request,
+        which followers await instead of starting their own synthesis).
+        Otherwise the caller is the leader and gets an iterator over
+        ``producer``'s chunks as they arrive. The synthesis itself runs in its
+        own task, which stores the result and hands it to any followers; the
+        leader's client disconnecting or reading slowly never aborts or stalls
+        the audio the followers are waiting for.
+        """
+        # Hash once; lookup, in-flight map, store and the caller's ETag all reuse it
+        cache_key = self._get_cache_key(key)
+        cached = await self._read(cache_key)
+        if cached:
+            return cache_key, cached
+
+        slot, future, leader = self._join_inflight(cache_key)
+        if not leader:
+            # shield: a follower disconnecting must not cancel the leader's work
+            return cache_key, await asyncio.shield(future)
+        chunks: asyncio.Queue = asyncio.Queue()
+        task = asyncio.create_task(self._fill(cache_key, slot, future, producer(), chunks))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return cache_key, self._drain(chunks)
+
+    async def _fill(self, cache_key: str, slot: tuple, future: asyncio.Future,
+                    chunks: AsyncIterator[bytes], queue: asyncio.Queue) -> None:
+        """Run one synthesis to completion, feeding the leader's queue and the cache.
+
+        The queue ends with None on success or the exception on failure.
+        """
+        # Keep the chunk objects and join once at the end: no regrowth, one copy
+        collected = []
+        try:
+            async for chunk in chunks:
+                collected.append(chunk)
+                queue.put_nowait(chunk)
+            audio = b"".join(collected)
+            if not audio:
+                raise ValueError("No audio data generated")
+            await self._store(cache_key, audio)
+        except BaseException as e:
+            # Cancelled (e.g. server shutdown) — waiters just see a failure
+            error = e if isinstance(e, Exception) else RuntimeError("TTS synthesis was aborted")
+            self._settle(slot, future, error=error)
+            queue.put_nowait(error)
+            if error is not e:
+                raise
+            return
+        self._settle(slot, future, audio)
+        queue.put_nowait(None)
+
+    @staticmethod
+    async def _drain(queue: asyncio.Queue) -> AsyncIterator[bytes]:
+        """Yield the leader's chunks from the synthesis task as they arrive."""
+        while (item := await queue.get()) is not None:
+            if isinstance(item, Exception):
+                raise item
+            yield item
 
 
 # Global cache instance
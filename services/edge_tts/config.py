@@ -7,6 +7,14 @@ CACHE_ENABLED = os.getenv("TTS_CACHE_ENABLED", "true").lower() == "true"
 CACHE_DIR = Path(os.getenv("TTS_CACHE_DIR", "./cache/tts"))
 DEFAULT_VOICE = os.getenv("TTS_DEFAULT_VOICE", "en-US-AnaNeural")
 MAX_TEXT_LENGTH = int(os.getenv("TTS_MAX_TEXT_LENGTH", "5000"))
+# Seconds the fetched voice list is reused before asking Microsoft again
+VOICES_CACHE_TTL = int(os.getenv("TTS_VOICES_CACHE_TTL", "3600"))
+# Split long text into sentences and synthesize them concurrently. Off by
+# default: parallel requests to Edge TTS are more likely to be throttled.
+PARALLEL_TTS = os.getenv("TTS_PARALLEL", "false").lower() == "true"
+TTS_CONCURRENCY = int(os.getenv("TTS_CONCURRENCY", "3"))
+# In-memory LRU in front of CACHE_DIR; 0 disables it
+MEM_CACHE_MAX_BYTES = int(os.getenv("TTS_MEM_CACHE_MB", "64")) * 1024 * 1024
 
 
 def ensure_directories():
@@ -3,13 +3,17 @@
 Auto-loaded by the service loader for the tester Docs tab.
 """
 
-NOTES = [
+from types import MappingProxyType
+from typing import Any, Mapping
+
+NOTES: tuple[str, ...] = (
     "Returns audio/mpeg binary — save the response as an .mp3 file",
     "Use <code>list_voices: true</code> to discover all available voices before generating",
     "Rate, pitch, and volume accept percentage strings like <code>\"+50%\"</code> or <code>\"-20%\"</code>",
-]
+)
 
-EXAMPLES = [
+# Read-only so the docs/tester code can never edit the shared examples in place
+EXAMPLES: tuple[Mapping[str, Any], ...] = tuple(MappingProxyType(e) for e in [
     {
         "title": "Basic Text to Speech",
         "description": "Convert text to speech using the default English voice",
@@ -40,7 +44,7 @@ EXAMPLES = [
         "description": "Get a list of all available voices grouped by locale",
         "body": {"list_voices": True},
     },
-]
+])
 
 CODE_EXAMPLES = {
     "curl": '''curl -X POST '{base_url}/tts' \\
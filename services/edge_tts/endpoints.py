@@ -1,21 +1,100 @@
 """TTS API endpoint — single unified endpoint."""
 
+import asyncio
+import functools
 import logging
-from datetime import datetime, timezone
+import time
+from collections import defaultdict
 
-import edge_tts
-from fastapi import APIRouter, HTTPException, Response
+import orjson
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 
+from config import Config
+from utils import etag_matches, utc_now_iso
 from . import config
 from .models import TTSRequest
-from .engine import generate_tts
+from .engine import stream_tts
 
 router = APIRouter(prefix="/tts", tags=["TTS"])
 logger = logging.getLogger(__name__)
 
+# (fetched_at, JSON body) — time.monotonic(); the list only changes upstream,
+# so it is serialized once per fetch rather than on every request
+_voices_cache: tuple[float, bytes] | None = None
+_voices_lock = asyncio.Lock()
+
+
+async def _get_voices() -> bytes:
+    """The grouped voice list as JSON, fetched at most once per VOICES_CACHE_TTL."""
+    global _voices_cache
+    cached = _voices_cache
+    if cached and time.monotonic() - cached[0] < config.VOICES_CACHE_TTL:
+        return cached[1]
+
+    # One upstream fetch at a time; waiters reuse whatever it stored
+    async with _voices_lock:
+        cached = _voices_cache
+        if cached and time.monotonic() - cached[0] < config.VOICES_CACHE_TTL:
+            return cached[1]
+
+        import edge_tts
+
+        all_voices = await edge_tts.list_voices()
+
+        voices_by_locale = defaultdict(list)
+        for v in all_voices:
+            voices_by_locale[v["Locale"]].append({
+                "name": v["ShortName"],
+                "gender": v["Gender"],
+                "display": v.get("FriendlyName") or v["ShortName"],
+            })
+
+        payload = orjson.dumps({
+            "total": len(all_voices),
+            "default": config.DEFAULT_VOICE,
+            "voices": voices_by_locale,
+        })
+        _voices_cache = (time.monotonic(), payload)
+        return payload
+
+
+_CACHE_CONTROL = "public, max-age=3600"
+
+
+@functools.lru_cache(maxsize=256)
+def _static_headers(voice: str, rate: str, pitch: str, volume: str) -> tuple[tuple[bytes, bytes], ...]:
+    """Headers that depend only on the voice settings, encoded once per combination.
+
+    Kept in Starlette's raw (lowercase name, latin-1 value) form so responses
+    can take them as-is instead of re-encoding a dict every time.
+    """
+    return (
+        (b"content-disposition", b"inline; filename=speech.mp3"),
+        (b"cache-control", _CACHE_CONTROL.encode("latin-1")),
+        (b"x-tts-voice", voice.encode("latin-1")),
+        (b"x-tts-rate", rate.encode("latin-1")),
+        (b"x-tts-pitch", pitch.encode("latin-1")),
+        (b"x-tts-volume", volume.encode("latin-1")),
+    )
+
+
+def _add_headers(response: Response, request: TTSRequest, voice_used: str, *extra: tuple[bytes, bytes]) -> Response:
+    """Append the cached settings headers plus the per-request ones."""
+    response.raw_headers.extend(_static_headers(
+        voice_used,
+        request.rate or "+0%",
+        request.pitch or "+0Hz",
+        request.volume or "+0%",
+    ))
+    response.raw_headers.append((b"x-text-length", b"%d" % len(request.text)))
+    response.raw_headers.append((b"x-generated-at", utc_now_iso().encode("latin-1")))
+    response.raw_headers.extend(extra)
+    return response
+
 
 @router.post("", summary="Text to Speech")
-async def tts(request: TTSRequest):
+async def tts(request: TTSRequest, http_request: Request):
     """Unified TTS endpoint.
 
     - Send `{"list_voices": true}` to list all available voices.
@@ -25,26 +104,11 @@ async def tts(request: TTSRequest):
     # ── Voice listing mode ──────────────────────────────────────────
     if request.list_voices:
         try:
-            all_voices = await edge_tts.list_voices()
+            return Response(await _get_voices(), media_type="application/json")
         except Exception as e:
-            logger.error(f"✗ Failed to fetch voices: {e}")
+            logger.error("✗ Failed to fetch voices: %s", e)
             raise HTTPException(status_code=500, detail={"success": False, "message": str(e)})
 
-        voices_by_locale = {}
-        for v in all_voices:
-            locale = v["Locale"]
-            voices_by_locale.setdefault(locale, []).append({
-                "name": v["ShortName"],
-                "gender": v["Gender"],
-                "display": v.get("FriendlyName", v["ShortName"]),
-            })
-
-        return {
-            "total": len(all_voices),
-            "default": config.DEFAULT_VOICE,
-            "voices": voices_by_locale,
-        }
-
     # ── Generation mode ─────────────────────────────────────────────
     if not request.text:
         raise HTTPException(
@@ -53,7 +117,7 @@ async def tts(request: TTSRequest):
         )
 
     try:
-        audio_data = await generate_tts(
+        digest, audio = await stream_tts(
             request.text,
             request.voice,
             request.rate,
@@ -63,32 +127,37 @@ async def tts(request: TTSRequest):
 
         voice_used = request.voice or config.DEFAULT_VOICE
 
-        logger.info(f"✓ TTS: {len(audio_data)} bytes, voice={voice_used}, text_len={len(request.text)}")
-
-        return Response(
-            content=audio_data,
-            media_type="audio/mpeg",
-            headers={
-                "Content-Disposition": "inline; filename=speech.mp3",
-                "Cache-Control": "public, max-age=3600",
-                "X-TTS-Voice": voice_used,
-                "X-TTS-Rate": request.rate or "+0%",
-                "X-TTS-Pitch": request.pitch or "+0Hz",
-                "X-TTS-Volume": request.volume or "+0%",
-                "X-Audio-Size": str(len(audio_data)),
-                "X-Text-Length": str(len(request.text)),
-                "X-Generated-At": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
-            },
-        )
+        if isinstance(audio, bytes):
+            # Complete audio in hand, so it can carry a validator for revalidation.
+            # The cache digest names the request, not the bytes (a re-synthesis
+            # may differ byte-wise), hence a weak ETag — and no rehash per hit
+            etag = f'W/"{digest}"'
+            if etag_matches(http_request.headers.get("if-none-match"), etag):
+                return Response(status_code=304, headers={"ETag": etag, "Cache-Control": _CACHE_CONTROL})
+
+            logger.info("✓ TTS: %d bytes, voice=%s, text_len=%d", len(audio), voice_used, len(request.text))
+            return _add_headers(
+                Response(content=audio, media_type="audio/mpeg"), request, voice_used,
+                (b"etag", etag.encode("latin-1")),
+                (b"x-audio-size", b"%d" % len(audio)),
+            )
+
+        # Fresh synthesis: send chunks as Edge TTS produces them (size unknown yet)
+        logger.info("✓ TTS: streaming, voice=%s, text_len=%d", voice_used, len(request.text))
+        return _add_headers(StreamingResponse(audio, media_type="audio/mpeg"), request, voice_used)
 
     except ValueError as e:
-        logger.warning(f"✗ TTS validation error: {e}")
+        logger.warning("✗ TTS validation error: %s", e)
         raise HTTPException(
             status_code=400,
             detail={"success": False, "message": "Invalid request parameters", "error": {"code": "VALIDATION_ERROR", "message": str(e)}},
         )
     except Exception as e:
-        logger.error(f"✗ TTS generation failed: {e}", exc_info=True)
+        logger.error(
+            "✗ TTS generation failed: %s", e,
+            exc_info=Config.DEBUG_TRACEBACKS,
+            extra={"voice": request.voice or config.DEFAULT_VOICE, "text_len": len(request.text)},
+        )
         raise HTTPException(
             status_code=500,
             detail={"success": False, "message": "TTS generation failed", "error": {"code": "GENERATION_ERROR", "message": str(e)}},
@@ -1,94 +1,135 @@
 """TTS engine - Text-to-speech generation using Microsoft Edge."""
 
-import io
 import re
+import asyncio
 import logging
-from typing import Optional
-
-import edge_tts
+from typing import AsyncIterator, List, Optional, Tuple, Union
 
 from . import config
 from .cache import cache
+from .prosody import normalize_pitch, normalize_rate, normalize_volume
 
 logger = logging.getLogger(__name__)
 
-# Patterns for rate/pitch/volume normalization
-_RATE_RE = re.compile(r'^([+-]?\d+)\s*%%*$')      # "+10%%" or "+10%" → "+10%"
-_PITCH_RE = re.compile(r'^([+-]?\d+)\s*(Hz)?$', re.IGNORECASE)  # "-2Hz" or "-2"
-_VOL_RE = re.compile(r'^([+-]?\d+)\s*%%*$')
-
-
-def _normalize_rate(val: str) -> str:
-    """Normalize rate: '+10', '+10%', '+10%%' all become '+10%'."""
-    val = val.strip()
-    m = _RATE_RE.match(val)
-    if m:
-        return f"{m.group(1)}%"
-    # bare number like "+10"
-    if re.match(r'^[+-]?\d+$', val):
-        return f"{val}%"
-    return val
-
-
-def _normalize_pitch(val: str) -> str:
-    """Normalize pitch: '-2', '-2Hz', '-2hz' all become '-2Hz'."""
-    val = val.strip()
-    m = _PITCH_RE.match(val)
-    if m:
-        return f"{m.group(1)}Hz"
-    return val
-
-
-def _normalize_volume(val: str) -> str:
-    """Normalize volume: '+20', '+20%', '+20%%' all become '+20%'."""
-    val = val.strip()
-    m = _VOL_RE.match(val)
-    if m:
-        return f"{m.group(1)}%"
-    if re.match(r'^[+-]?\d+$', val):
-        return f"{val}%"
-    return val
-
-
-async def generate_tts(
+# This service is I/O-bound: a request's time goes to the Edge TTS round trip
+# and moving MP3 bytes, not Python compute. Speedups come from caching,
+# streaming and fewer allocations; micro-optimizing parsing won't show up.
+
+
+def _normalize_params(voice: Optional[str], rate: str, pitch: str, volume: str) -> Tuple[str, str, str, str]:
+    """Apply the default voice and normalize rate/pitch/volume."""
+    if voice is None:
+        voice = config.DEFAULT_VOICE
+    # Handles CMD escaping like +10%% → +10%
+    return voice, normalize_rate(rate), normalize_pitch(pitch), normalize_volume(volume)
+
+
+async def stream_tts(
     text: str,
     voice: Optional[str] = None,
     rate: str = "+0%",
     pitch: str = "+0Hz",
     volume: str = "+0%"
-) -> bytes:
-    """Generate TTS audio. Checks cache first, generates new audio if not cached."""
+) -> Tuple[str, Union[bytes, AsyncIterator[bytes]]]:
+    """Generate TTS audio, streaming a fresh synthesis as it arrives.
+
+    Returns ``(digest, audio)``: the cache digest identifying this normalized
+    request, and the whole audio when it is already available (cache hit, or
+    an identical synthesis in flight), otherwise an async iterator of MP3
+    chunks. The first chunk is awaited here, so connection and "no audio"
+    errors are still raised to the caller before any response has started.
+    """
+    voice, rate, pitch, volume = _normalize_params(voice, rate, pitch, volume)
+
+    key = (voice, rate, pitch, volume, text)
+    digest, result = await cache.get_or_stream(key, lambda: _synthesize_chunks(*key))
+    if isinstance(result, bytes):
+        return digest, result
+    first = await result.__anext__()
+    return digest, _prepend(first, result)
+
+
+async def _prepend(first: bytes, rest: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    yield first
+    async for chunk in rest:
+        yield chunk
+
+
+# Sentence end: . ! or ? (plus closing quotes/brackets) before whitespace
+_SENTENCE_END_RE = re.compile(r'[.!?]+["\')\]]*(?=\s)')
+# Tokens whose trailing period doesn't end a sentence
+_ABBREVIATIONS = frozenset({
+    "mr.", "mrs.", "ms.", "dr.", "prof.", "sr.", "jr.", "st.", "vs.", "etc.",
+    "e.g.", "i.e.", "approx.", "no.", "fig.", "inc.", "ltd.", "co.",
+})
+_MIN_SENTENCE_LEN = 10
+
+
+def _split_sentences(text: str) -> List[str]:
+    """Split text into sentences for parallel synthesis.
+
+    Splits after '.', '!' or '?' followed by whitespace, except after common
+    abbreviations and single-letter initials. Pieces shorter than
+    _MIN_SENTENCE_LEN are merged into their neighbour so no request is
+    wasted on a fragment.
+    """
+    sentences = []
+    start = 0
+    for m in _SENTENCE_END_RE.finditer(text):
+        piece = text[start:m.end()]
+        last_word = piece.rsplit(None, 1)[-1].lower() if piece.strip() else ""
+        if last_word in _ABBREVIATIONS or (len(last_word) == 2 and last_word[0].isalpha()):
+            continue
+        sentences.append(piece.strip())
+        start = m.end()
+    sentences.append(text[start:].strip())
+
+    merged = []
+    for sentence in filter(None, sentences):
+        if merged and (len(sentence) < _MIN_SENTENCE_LEN or len(merged[-1]) < _MIN_SENTENCE_LEN):
+            merged[-1] = f"{merged[-1]} {sentence}"
+        else:
+            merged.append(sentence)
+    return merged
+
+
+async def _stream_one(voice: str, rate: str, pitch: str, volume: str, text: str) -> AsyncIterator[bytes]:
+    """Yield MP3 chunks for a single Edge TTS request."""
+    # Deferred: the client (and aiohttp) is only needed once audio is made
+    import edge_tts
 
-    if voice is None:
-        voice = config.DEFAULT_VOICE
-    
-    # Normalize rate/pitch/volume (handles CMD escaping like +10%% → +10%)
-    rate = _normalize_rate(rate)
-    pitch = _normalize_pitch(pitch)
-    volume = _normalize_volume(volume)
-    
-    # Check cache first
-    cached = cache.get(text, voice, rate, pitch, volume)
-    if cached:
-        return cached
-    
-    # Generate new audio
-    logger.info(f"Generating TTS: voice={voice}, rate={rate}, pitch={pitch}, volume={volume}")
-    
     communicate = edge_tts.Communicate(text, voice, rate=rate, pitch=pitch, volume=volume)
-    
-    audio_buffer = io.BytesIO()
     async for chunk in communicate.stream():
         if chunk["type"] == "audio":
-            audio_buffer.write(chunk["data"])
-    
-    audio_data = audio_buffer.getvalue()
-    
-    if not audio_data:
-        raise ValueError("No audio data generated")
-    
-    # Cache the result
-    cache.set(text, voice, rate, pitch, volume, audio_data)
-    
-    logger.info(f"Generated {len(audio_data)} bytes of audio")
-    return audio_data
+            yield chunk["data"]
+
+
+async def _synthesize_chunks(voice: str, rate: str, pitch: str, volume: str, text: str) -> AsyncIterator[bytes]:
+    """Yield MP3 chunks from one Edge TTS synthesis (no caching).
+
+    With PARALLEL_TTS on, multi-sentence text is synthesized one request per
+    sentence, up to TTS_CONCURRENCY at a time, and each sentence's audio is
+    yielded in order as soon as it and everything before it is done. MP3
+    frames concatenate cleanly, so the result plays as one file.
+    """
+    logger.info("Generating TTS: voice=%s, rate=%s, pitch=%s, volume=%s", voice, rate, pitch, volume)
+
+    sentences = _split_sentences(text) if config.PARALLEL_TTS else []
+    if len(sentences) < 2:
+        async for chunk in _stream_one(voice, rate, pitch, volume, text):
+            yield chunk
+        return
+
+    limit = asyncio.Semaphore(max(1, config.TTS_CONCURRENCY))
+
+    async def synthesize_sentence(sentence: str) -> bytes:
+        async with limit:
+            return b"".join([c async for c in _stream_one(voice, rate, pitch, volume, sentence)])
+
+    tasks = [asyncio.create_task(synthesize_sentence(s)) for s in sentences]
+    try:
+        for task in tasks:
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
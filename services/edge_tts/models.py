@@ -1,9 +1,16 @@
 """TTS request models."""
 
+import re
 from typing import Optional
 from pydantic import BaseModel, field_validator
 
 from . import config
+from .prosody import normalize_pitch, normalize_rate, normalize_volume
+
+# Forms Edge TTS accepts once normalized; checked here so a malformed value
+# is rejected before any cache lookup or synthesis is set up
+_SIGNED_PERCENT_RE = re.compile(r'^[+-]\d+%$')
+_SIGNED_HZ_RE = re.compile(r'^[+-]\d+Hz$')
 
 
 class TTSRequest(BaseModel):
@@ -28,3 +35,22 @@ class TTSRequest(BaseModel):
             if len(v) > config.MAX_TEXT_LENGTH:
                 raise ValueError(f"Text too long. Maximum {config.MAX_TEXT_LENGTH} characters")
         return v
+
+    @field_validator('rate', 'volume')
+    @classmethod
+    def validate_percent(cls, v, info):
+        if v is None or v == "+0%":
+            return v
+        normalize = normalize_rate if info.field_name == 'rate' else normalize_volume
+        if not _SIGNED_PERCENT_RE.match(normalize(v)):
+            raise ValueError(f"Invalid {info.field_name} '{v}': use a signed percentage like '+10%' or '-20%'")
+        return v
+
+    @field_validator('pitch')
+    @classmethod
+    def validate_pitch(cls, v):
+        if v is None or v == "+0Hz":
+            return v
+        if not _SIGNED_HZ_RE.match(normalize_pitch(v)):
+            raise ValueError(f"Invalid pitch '{v}': use signed hertz like '+5Hz' or '-2Hz'")
+        return v
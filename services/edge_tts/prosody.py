@@ -0,0 +1,29 @@
+"""Rate/pitch/volume normalization shared by the request models and the engine."""
+
+import re
+
+# Patterns for rate/pitch/volume normalization, compiled once. '%*' also
+# matches a bare number, so no second "digits only" re.match is needed.
+_PERCENT_RE = re.compile(r'^([+-]?\d+)\s*%*$')  # "+10", "+10%", "+10%%" → "+10%"
+_PITCH_RE = re.compile(r'^([+-]?\d+)\s*(?:Hz)?$', re.IGNORECASE)  # "-2Hz" or "-2"
+
+
+def normalize_rate(val: str) -> str:
+    """Normalize rate: '+10', '+10%', '+10%%' all become '+10%'."""
+    val = val.strip()
+    m = _PERCENT_RE.match(val)
+    return f"{m[1]}%" if m else val
+
+
+def normalize_pitch(val: str) -> str:
+    """Normalize pitch: '-2', '-2Hz', '-2hz' all become '-2Hz'."""
+    val = val.strip()
+    m = _PITCH_RE.match(val)
+    return f"{m[1]}Hz" if m else val
+
+
+def normalize_volume(val: str) -> str:
+    """Normalize volume: '+20', '+20%', '+20%%' all become '+20%'."""
+    val = val.strip()
+    m = _PERCENT_RE.match(val)
+    return f"{m[1]}%" if m else val
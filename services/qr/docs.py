@@ -3,14 +3,18 @@
 Auto-loaded by the service loader for the tester Docs tab.
 """
 
-NOTES = [
+from types import MappingProxyType
+from typing import Any, Mapping
+
+NOTES: tuple[str, ...] = (
     "Returns the QR code image directly — <code>png</code>, <code>svg</code>, <code>pdf</code>, <code>eps</code>, or <code>txt</code>",
     "For WiFi QR codes, use <code>ssid</code> instead of <code>data</code>",
     "Custom colors accept CSS color names, hex (<code>#FF0000</code>), or RGB values",
     "Error correction levels: <strong>L</strong> (7%), <strong>M</strong> (15%), <strong>Q</strong> (25%), <strong>H</strong> (30%)",
-]
+)
 
-EXAMPLES = [
+# Read-only so the docs/tester code can never edit the shared examples in place
+EXAMPLES: tuple[Mapping[str, Any], ...] = tuple(MappingProxyType(e) for e in [
     {
         "title": "Website URL",
         "description": "QR code linking to a website — scan with any phone camera",
@@ -96,7 +100,7 @@ EXAMPLES = [
         "description": "Open a location in maps — great for business addresses",
         "body": {"data": "geo:40.7128,-74.0060?q=New+York+City"},
     },
-]
+])
 
 CODE_EXAMPLES = {
     "curl": '''curl -X POST '{base_url}/qr' \\
@@ -1,18 +1,95 @@
 """QR Code API endpoint — single unified endpoint."""
 
-from fastapi import APIRouter, HTTPException, Response
+import asyncio
+import functools
 import logging
-from datetime import datetime, timezone
+import os
+from concurrent.futures import ThreadPoolExecutor
 
+from fastapi import APIRouter, HTTPException, Request, Response
+
+from config import Config
+from utils import etag_matches, utc_now_iso
 from .models import QRRequest
-from .generator import generate_qr_code, generate_wifi_qr
+from .generator import clear_render_cache, generate_qr_code, generate_wifi_qr
 
 router = APIRouter(prefix="/qr", tags=["QR Code"])
 logger = logging.getLogger(__name__)
 
+# segno rendering is synchronous CPU work; run it off the event loop on a
+# bounded pool so a burst of QR requests can't starve other endpoints
+_QR_POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 4, thread_name_prefix="qr")
+
+# SSID → filename-safe text: spaces become '_', quotes can't close the
+# quoted filename, and control characters are dropped (they'd break the header)
+_SSID_FILENAME_TABLE = str.maketrans(
+    {" ": "_", '"': "_", **{chr(c): None for c in (*range(32), 127)}}
+)
+
+
+async def _in_pool(fn, *args, **kwargs):
+    """Run a sync generator function on the QR pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_QR_POOL, functools.partial(fn, *args, **kwargs))
+
+
+_CACHE_CONTROL = "public, max-age=3600"
+
+
+def _not_modified(http_request: Request, metadata: dict) -> Response | None:
+    """A 304 when the client already holds this exact image."""
+    if etag_matches(http_request.headers.get("if-none-match"), metadata['etag']):
+        return Response(status_code=304, headers={"ETag": metadata['etag'], "Cache-Control": _CACHE_CONTROL})
+    return None
+
+
+def _raw_headers(pairs) -> tuple[tuple[bytes, bytes], ...]:
+    """Encode (name, value) pairs into Starlette's raw header form."""
+    return tuple((name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in pairs)
+
+
+# Everything but X-Generated-At is fixed for a given image, so repeat
+# renders (served from the generator's cache) reuse the encoded headers
+@functools.lru_cache(maxsize=256)
+def _qr_headers(ext, version, error, mode, is_micro, modules_count, size, data_length, etag):
+    return _raw_headers((
+        ("Content-Disposition", f'inline; filename="qrcode.{ext}"'),
+        ("Cache-Control", _CACHE_CONTROL),
+        ("ETag", etag),
+        ("X-QR-Version", version),
+        ("X-QR-Error-Correction", error),
+        ("X-QR-Mode", mode),
+        ("X-QR-Is-Micro", str(is_micro)),
+        ("X-QR-Modules-Count", str(modules_count)),
+        ("X-QR-Size", str(size)),
+        ("X-QR-Data-Length", str(data_length)),
+    ))
+
+
+@functools.lru_cache(maxsize=256)
+def _wifi_headers(filename, version, ssid, security, size, etag):
+    return _raw_headers((
+        ("Content-Disposition", f'inline; filename="{filename}"'),
+        ("Cache-Control", _CACHE_CONTROL),
+        ("ETag", etag),
+        ("X-QR-Version", version),
+        ("X-QR-Type", "WiFi"),
+        ("X-WiFi-SSID", ssid),
+        ("X-WiFi-Security", security),
+        ("X-QR-Size", str(size)),
+    ))
+
+
+def _image_response(image_bytes: bytes, metadata: dict, headers: tuple[tuple[bytes, bytes], ...]) -> Response:
+    """Image response with the cached headers plus the current timestamp."""
+    response = Response(content=image_bytes, media_type=metadata['content_type'])
+    response.raw_headers.extend(headers)
+    response.raw_headers.append((b"x-generated-at", utc_now_iso().encode("latin-1")))
+    return response
+
 
 @router.post("", summary="QR Code Generator")
-async def qr(request: QRRequest):
+async def qr(request: QRRequest, http_request: Request):
     """Unified QR code endpoint.
 
     - Send `{"data": "..."}` to generate a standard QR code.
@@ -22,7 +99,8 @@ async def qr(request: QRRequest):
     # ── WiFi QR mode ────────────────────────────────────────────────
     if request.ssid:
         try:
-            image_bytes, metadata = generate_wifi_qr(
+            image_bytes, metadata = await _in_pool(
+                generate_wifi_qr,
                 ssid=request.ssid,
                 password=request.password,
                 security=request.security,
@@ -37,31 +115,29 @@ async def qr(request: QRRequest):
                 boost_error=request.boost_error,
             )
 
+            not_modified = _not_modified(http_request, metadata)
+            if not_modified:
+                return not_modified
+
             ext = request.format.value
-            filename = f"wifi-{request.ssid.replace(' ', '_')}.{ext}"
-
-            logger.info(f"WiFi QR: {request.ssid}, {len(image_bytes)} bytes")
-
-            return Response(
-                content=image_bytes,
-                media_type=metadata['content_type'],
-                headers={
-                    "Content-Disposition": f'inline; filename="{filename}"',
-                    "Cache-Control": "public, max-age=3600",
-                    "X-QR-Version": metadata['version'],
-                    "X-QR-Type": "WiFi",
-                    "X-WiFi-SSID": metadata['wifi_ssid'],
-                    "X-WiFi-Security": metadata['wifi_security'],
-                    "X-QR-Size": str(metadata['size']),
-                    "X-Generated-At": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
-                },
-            )
+            filename = f"wifi-{request.ssid.translate(_SSID_FILENAME_TABLE)}.{ext}"
+
+            logger.info("WiFi QR: %s, %d bytes", request.ssid, len(image_bytes))
+
+            return _image_response(image_bytes, metadata, _wifi_headers(
+                filename,
+                metadata['version'],
+                metadata['wifi_ssid'],
+                metadata['wifi_security'],
+                metadata['size'],
+                metadata['etag'],
+            ))
 
         except ValueError as e:
-            logger.warning(f"WiFi QR validation error: {e}")
+            logger.warning("WiFi QR validation error: %s", e)
             raise HTTPException(status_code=400, detail={"success": False, "message": str(e)})
         except Exception as e:
-            logger.error(f"WiFi QR generation failed: {e}", exc_info=True)
+            logger.error("WiFi QR generation failed: %s", e, exc_info=Config.DEBUG_TRACEBACKS)
             raise HTTPException(status_code=500, detail={"success": False, "message": str(e)})
 
     # ── Standard QR mode ────────────────────────────────────────────
@@ -72,33 +148,43 @@ async def qr(request: QRRequest):
         )
 
     try:
-        image_bytes, metadata = generate_qr_code(request)
+        image_bytes, metadata = await _in_pool(generate_qr_code, request)
+
+        not_modified = _not_modified(http_request, metadata)
+        if not_modified:
+            return not_modified
 
         ext = request.format.value
-        filename = f"qrcode.{ext}"
-
-        logger.info(f"QR generated: {metadata['version']}, {len(image_bytes)} bytes")
-
-        return Response(
-            content=image_bytes,
-            media_type=metadata['content_type'],
-            headers={
-                "Content-Disposition": f'inline; filename="{filename}"',
-                "Cache-Control": "public, max-age=3600",
-                "X-QR-Version": metadata['version'],
-                "X-QR-Error-Correction": metadata['error_correction'],
-                "X-QR-Mode": metadata['mode'],
-                "X-QR-Is-Micro": str(metadata['is_micro']),
-                "X-QR-Modules-Count": str(metadata['modules_count']),
-                "X-QR-Size": str(metadata['size']),
-                "X-QR-Data-Length": str(metadata['data_length']),
-                "X-Generated-At": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
-            },
-        )
+
+        logger.info("QR generated: %s, %d bytes", metadata['version'], len(image_bytes))
+
+        return _image_response(image_bytes, metadata, _qr_headers(
+            ext,
+            metadata['version'],
+            metadata['error_correction'],
+            metadata['mode'],
+            metadata['is_micro'],
+            metadata['modules_count'],
+            metadata['size'],
+            metadata['data_length'],
+            metadata['etag'],
+        ))
 
     except ValueError as e:
-        logger.warning(f"QR validation error: {e}")
+        logger.warning("QR validation error: %s", e)
         raise HTTPException(status_code=400, detail={"success": False, "message": str(e)})
     except Exception as e:
-        logger.error(f"QR generation failed: {e}", exc_info=True)
+        logger.error("QR generation failed: %s", e, exc_info=Config.DEBUG_TRACEBACKS)
         raise HTTPException(status_code=500, detail={"success": False, "message": str(e)})
+
+
+# Unauthenticated, so it only exists in debug mode and never shows up in
+# /api, the tester, or the service's route count
+@router.delete("/admin/cache", summary="Clear QR Cache", include_in_schema=False)
+async def clear_qr_cache():
+    """Drop every cached QR render."""
+    if not Config.DEBUG:
+        raise HTTPException(status_code=404, detail="Not Found")
+    cleared = clear_render_cache()
+    logger.info("QR render cache cleared: %d entries", cleared)
+    return {"success": True, "cleared": cleared}
@@ -1,15 +1,130 @@
 """QR code generation engine using segno library."""
 
+import hashlib
 import io
 import logging
+import threading
+from collections import OrderedDict
 from typing import Optional, Tuple
 
-import segno
-
-from .models import QRRequest, QRFormat, QRErrorCorrection
+from config import Config
+from .models import MICRO_MAX_CHARS, MICRO_TOO_LONG, QRRequest, QRFormat, QRErrorCorrection
 
 logger = logging.getLogger(__name__)
 
+# Rendered images for identical requests (e.g. a WiFi poster or marketing URL
+# requested over and over), kept in an LRU bounded by total bytes since a
+# large scale can make a single render several MB; clear with /qr/admin/cache
+RENDER_CACHE_MAX_BYTES = 32 * 1024 * 1024
+# Renders bigger than this are served but never cached
+RENDER_CACHE_MAX_ITEM_BYTES = 1024 * 1024
+
+_render_cache: OrderedDict[tuple, Tuple[bytes, tuple]] = OrderedDict()
+_render_cache_bytes = 0
+_render_cache_lock = threading.Lock()
+
+
+def _save_text(qr, buffer: io.BytesIO, kind: str, save_kwargs: dict) -> None:
+    """Save a text-based format (EPS/TXT) straight into a bytes buffer as UTF-8."""
+    text = io.TextIOWrapper(buffer, encoding='utf-8', write_through=True, newline='')
+    qr.save(text, kind=kind, **save_kwargs)
+    text.detach()  # leave the buffer open for the caller
+
+
+def _render(
+    data: str,
+    output_format: QRFormat,
+    error: Optional[str],
+    micro: Optional[bool],
+    boost_error: Optional[bool],
+    save_items: Tuple[Tuple[str, object], ...],
+) -> Tuple[bytes, tuple]:
+    """Build and serialize a QR code, or return the cached render.
+
+    Returns (image_bytes, (version, error_correction, mode, is_micro,
+    modules_count, content_type, etag)). The metadata is a tuple so the
+    cached result can't be modified by callers.
+    """
+    global _render_cache_bytes
+    key = (data, output_format, error, micro, boost_error, save_items)
+    with _render_cache_lock:
+        cached = _render_cache.get(key)
+        if cached is not None:
+            _render_cache.move_to_end(key)
+            return cached
+
+    result = _build(*key)
+
+    # The key holds the (up to 4296 char) data too, so it counts toward the bound
+    cost = len(result[0]) + len(data)
+    if cost > RENDER_CACHE_MAX_ITEM_BYTES:
+        return result
+    with _render_cache_lock:
+        old = _render_cache.pop(key, None)
+        if old is not None:
+            _render_cache_bytes -= len(old[0]) + len(data)
+        _render_cache[key] = result
+        _render_cache_bytes += cost
+        while _render_cache_bytes > RENDER_CACHE_MAX_BYTES:
+            evicted_key, (evicted_bytes, _) = _render_cache.popitem(last=False)
+            _render_cache_bytes -= len(evicted_bytes) + len(evicted_key[0])
+    return result
+
+
+def _build(
+    data: str,
+    output_format: QRFormat,
+    error: Optional[str],
+    micro: Optional[bool],
+    boost_error: Optional[bool],
+    save_items: Tuple[Tuple[str, object], ...],
+) -> Tuple[bytes, tuple]:
+    """Build and serialize a QR code (uncached; see _render)."""
+    if micro and len(data) > MICRO_MAX_CHARS:
+        raise ValueError(MICRO_TOO_LONG)
+
+    import segno
+
+    qr = segno.make(data, error=error, micro=micro, boost_error=boost_error)
+    save_kwargs = dict(save_items)
+
+    buffer = io.BytesIO()
+
+    if output_format == QRFormat.PNG:
+        qr.save(buffer, kind='png', **save_kwargs)
+        content_type = 'image/png'
+    elif output_format == QRFormat.SVG:
+        save_kwargs['xmldecl'] = False
+        save_kwargs['svgns'] = True
+        qr.save(buffer, kind='svg', **save_kwargs)
+        content_type = 'image/svg+xml'
+    elif output_format == QRFormat.PDF:
+        qr.save(buffer, kind='pdf', **save_kwargs)
+        content_type = 'application/pdf'
+    elif output_format == QRFormat.EPS:
+        _save_text(qr, buffer, 'eps', save_kwargs)
+        content_type = 'application/postscript'
+    elif output_format == QRFormat.TXT:
+        txt_kwargs = {k: v for k, v in save_kwargs.items() if k in ('border',)}
+        _save_text(qr, buffer, 'txt', txt_kwargs)
+        content_type = 'text/plain'
+
+    image_bytes = buffer.getvalue()
+    etag = f'"{hashlib.blake2b(image_bytes, digest_size=16).hexdigest()}"'
+    modules_count = len(qr.matrix[0]) if qr.matrix else 0
+
+    return image_bytes, (qr.designator, qr.error, qr.mode, qr.is_micro, modules_count, content_type, etag)
+
+
+def clear_render_cache() -> int:
+    """Empty the render cache; returns how many entries were dropped."""
+    global _render_cache_bytes
+    with _render_cache_lock:
+        cleared = len(_render_cache)
+        _render_cache.clear()
+        _render_cache_bytes = 0
+    return cleared
+
 
 def generate_qr_code(request: QRRequest) -> Tuple[bytes, dict]:
     """Generate QR code from request parameters.
@@ -21,13 +136,6 @@ def generate_qr_code(request: QRRequest) -> Tuple[bytes, dict]:
         Tuple of (image_bytes, metadata_dict)
     """
     try:
-        qr = segno.make(
-            request.data,
-            error=request.error_correction.value if request.error_correction else None,
-            micro=request.micro,
-            boost_error=request.boost_error
-        )
-
         save_kwargs = {
             'scale': request.scale,
             'border': request.border,
@@ -41,52 +149,34 @@ def generate_qr_code(request: QRRequest) -> Tuple[bytes, dict]:
             else:
                 save_kwargs['light'] = request.light
 
-        buffer = io.BytesIO()
-
-        if request.format == QRFormat.PNG:
-            qr.save(buffer, kind='png', **save_kwargs)
-            content_type = 'image/png'
-        elif request.format == QRFormat.SVG:
-            save_kwargs['xmldecl'] = False
-            save_kwargs['svgns'] = True
-            qr.save(buffer, kind='svg', **save_kwargs)
-            content_type = 'image/svg+xml'
-        elif request.format == QRFormat.PDF:
-            qr.save(buffer, kind='pdf', **save_kwargs)
-            content_type = 'application/pdf'
-        elif request.format == QRFormat.EPS:
-            str_buffer = io.StringIO()
-            qr.save(str_buffer, kind='eps', **save_kwargs)
-            buffer = io.BytesIO(str_buffer.getvalue().encode('utf-8'))
-            content_type = 'application/postscript'
-        elif request.format == QRFormat.TXT:
-            txt_kwargs = {k: v for k, v in save_kwargs.items() if k in ('border',)}
-            str_buffer = io.StringIO()
-            qr.save(str_buffer, kind='txt', **txt_kwargs)
-            buffer = io.BytesIO(str_buffer.getvalue().encode('utf-8'))
-            content_type = 'text/plain'
+        image_bytes, (version, error, mode, is_micro, modules_count, content_type, etag) = _render(
+            request.data,
+            request.format,
+            request.error_correction.value if request.error_correction else None,
+            request.micro,
+            request.boost_error,
+            tuple(save_kwargs.items()),
+        )
 
         metadata = {
-            'version': qr.designator,
-            'error_correction': qr.error,
-            'mode': qr.mode,
-            'is_micro': qr.is_micro,
-            'size': buffer.tell(),
+            'version': version,
+            'error_correction': error,
+            'mode': mode,
+            'is_micro': is_micro,
+            'size': len(image_bytes),
             'format': request.format.value,
             'data_length': len(request.data),
             'content_type': content_type,
-            'modules_count': len(qr.matrix[0]) if qr.matrix else 0
+            'modules_count': modules_count,
+            'etag': etag,
         }
 
-        buffer.seek(0)
-        image_bytes = buffer.read()
-
-        logger.info(f"QR: {metadata['version']}, {len(image_bytes)} bytes, format={request.format.value}")
+        logger.info("QR: %s, %d bytes, format=%s", metadata['version'], len(image_bytes), request.format.value)
 
         return image_bytes, metadata
 
     except Exception as e:
-        logger.error(f"QR generation failed: {e}", exc_info=True)
+        logger.error("QR generation failed: %s", e, exc_info=Config.DEBUG_TRACEBACKS)
         raise
 
 
@@ -115,13 +205,6 @@ def generate_wifi_qr(
             hidden=hidden
         )
 
-        wifi = segno.make(
-            wifi_data,
-            error=error_correction.value if error_correction else None,
-            micro=micro,
-            boost_error=boost_error,
-        )
-
         save_kwargs = {
             'scale': scale,
             'border': border,
@@ -133,50 +216,32 @@ def generate_wifi_qr(
         elif light:
             save_kwargs['light'] = light
 
-        buffer = io.BytesIO()
-
-        if output_format == QRFormat.PNG:
-            wifi.save(buffer, kind='png', **save_kwargs)
-            content_type = 'image/png'
-        elif output_format == QRFormat.SVG:
-            save_kwargs['xmldecl'] = False
-            save_kwargs['svgns'] = True
-            wifi.save(buffer, kind='svg', **save_kwargs)
-            content_type = 'image/svg+xml'
-        elif output_format == QRFormat.PDF:
-            wifi.save(buffer, kind='pdf', **save_kwargs)
-            content_type = 'application/pdf'
-        elif output_format == QRFormat.EPS:
-            str_buffer = io.StringIO()
-            wifi.save(str_buffer, kind='eps', **save_kwargs)
-            buffer = io.BytesIO(str_buffer.getvalue().encode('utf-8'))
-            content_type = 'application/postscript'
-        elif output_format == QRFormat.TXT:
-            txt_kwargs = {k: v for k, v in save_kwargs.items() if k in ('border',)}
-            str_buffer = io.StringIO()
-            wifi.save(str_buffer, kind='txt', **txt_kwargs)
-            buffer = io.BytesIO(str_buffer.getvalue().encode('utf-8'))
-            content_type = 'text/plain'
+        image_bytes, (version, error, mode, is_micro, _, content_type, etag) = _render(
+            wifi_data,
+            output_format,
+            error_correction.value if error_correction else None,
+            micro,
+            boost_error,
+            tuple(save_kwargs.items()),
+        )
 
         metadata = {
-            'version': wifi.designator,
-            'error_correction': wifi.error,
-            'mode': wifi.mode,
-            'is_micro': wifi.is_micro,
-            'size': buffer.tell(),
+            'version': version,
+            'error_correction': error,
+            'mode': mode,
+            'is_micro': is_micro,
+            'size': len(image_bytes),
             'format': output_format.value,
             'content_type': content_type,
             'wifi_ssid': ssid,
-            'wifi_security': security
+            'wifi_security': security,
+            'etag': etag,
         }
 
-        buffer.seek(0)
-        image_bytes = buffer.read()
-
-        logger.info(f"WiFi QR: {ssid}, {len(image_bytes)} bytes, format={output_format.value}")
+        logger.info("WiFi QR: %s, %d bytes, format=%s", ssid, len(image_bytes), output_format.value)
 
         return image_bytes, metadata
 
     except Exception as e:
-        logger.error(f"WiFi QR generation failed: {e}", exc_info=True)
+        logger.error("WiFi QR generation failed: %s", e, exc_info=Config.DEBUG_TRACEBACKS)
         raise
@@ -1,9 +1,14 @@
 """QR code models."""
 
 from typing import Optional
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from enum import Enum
 
+# Largest Micro QR (M4, numeric) holds 35 characters; anything longer can
+# never fit, so it's rejected before segno does any encoding work
+MICRO_MAX_CHARS = 35
+MICRO_TOO_LONG = f"Micro QR codes hold at most {MICRO_MAX_CHARS} characters; set micro=false"
+
 
 class QRErrorCorrection(str, Enum):
     L = "L"
@@ -26,6 +31,9 @@ class QRRequest(BaseModel):
     - Set `data` to generate a standard QR code.
     - Set `ssid` to generate a WiFi QR code.
     """
+    # Handed to the render thread pool as-is; nothing should edit it on the way
+    model_config = ConfigDict(frozen=True)
+
     # Standard QR fields
     data: Optional[str] = None
 
@@ -36,8 +44,10 @@ class QRRequest(BaseModel):
     hidden: Optional[bool] = False
 
     # Shared configuration
-    scale: Optional[int] = 10
-    border: Optional[int] = 4
+    # Plain range checks are declared as constraints so pydantic-core enforces
+    # them without a Python validator call
+    scale: Optional[int] = Field(10, ge=1, le=100)
+    border: Optional[int] = Field(4, ge=0)
     dark: Optional[str] = "black"
     light: Optional[str] = "white"
     error_correction: Optional[QRErrorCorrection] = QRErrorCorrection.M
@@ -62,16 +72,11 @@ class QRRequest(BaseModel):
             raise ValueError("SSID cannot be empty")
         return v
 
-    @field_validator('scale')
-    @classmethod
-    def validate_scale(cls, v):
-        if v is not None and (v < 1 or v > 100):
-            raise ValueError("Scale must be between 1 and 100")
-        return v
-
-    @field_validator('border')
+    @field_validator('micro')
     @classmethod
-    def validate_border(cls, v):
-        if v is not None and v < 0:
-            raise ValueError("Border cannot be negative")
+    def validate_micro(cls, v, info):
+        # Runs after 'data' (field order), so the length is already validated
+        data = info.data.get('data')
+        if v and data and len(data) > MICRO_MAX_CHARS:
+            raise ValueError(MICRO_TOO_LONG)
         return v
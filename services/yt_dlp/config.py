@@ -7,6 +7,7 @@ OUTPUT_DIR = Path(os.getenv("YTDLP_OUTPUT_DIR", "./cache/yt_dlp"))
 RETRY_ATTEMPTS = int(os.getenv("YTDLP_RETRY_ATTEMPTS", "3"))
 SOCKET_TIMEOUT = int(os.getenv("YTDLP_SOCKET_TIMEOUT", "30"))
 CONCURRENT_FRAGMENTS = int(os.getenv("YTDLP_CONCURRENT_FRAGMENTS", "8"))
+MAX_CONCURRENT_DOWNLOADS = int(os.getenv("YTDLP_MAX_CONCURRENT_DOWNLOADS", "4"))
 
 
 def ensure_directories():
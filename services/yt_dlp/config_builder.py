@@ -12,6 +12,12 @@ from .formats import get_quality_format
 
 logger = logging.getLogger(__name__)
 
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
 
 class _YDLLogger:
     """Routes yt-dlp internal messages to Python logging."""
@@ -36,20 +42,47 @@ class _YDLLogger:
         self._log.error(msg)
 
 
-def _make_progress_hook(download_id: str):
-    """Create a progress hook that logs download progress."""
-    _last_log = {"t": 0}
+def _progress_bucket(downloaded: int, total) -> tuple:
+    """Progress bucket for the log gate; a line is logged when it changes.
+
+    With a known size that's every 5% (at most 21 lines per file). Without
+    one it's the leading two digits of the MiB count (10, 11 … 99, 100,
+    110 … MiB), so lines thin out logarithmically on long downloads.
+    """
+    if total:
+        return (0, downloaded * 20 // total)
+    mib = downloaded >> 20
+    digits = len(str(mib))
+    return (digits, mib // 10 ** max(0, digits - 2))
+
+
+def _make_progress_hook(download_id: str, clock=time.monotonic):
+    """Create a progress hook that logs download progress.
+
+    ``clock`` drives the log throttle; tests pass a fake one.
+    """
+    # yt-dlp calls this many times a second; most calls must return early
+    _last_log = {"t": float("-inf"), "bucket": None}
     dl_logger = logging.getLogger("download")
 
     def hook(d):
         status = d.get("status")
-        now = time.time()
 
         if status == "downloading":
+            downloaded = d.get("downloaded_bytes")
+            if downloaded is not None:
+                total = d.get("total_bytes") or d.get("total_bytes_estimate")
+                bucket = _progress_bucket(downloaded, total)
+                if bucket == _last_log["bucket"]:
+                    return
+
             # Throttle: log at most every 2 seconds
+            now = clock()
             if now - _last_log["t"] < 2:
                 return
             _last_log["t"] = now
+            if downloaded is not None:
+                _last_log["bucket"] = bucket
 
             pct = d.get("_percent_str", "?").strip()
             speed = d.get("_speed_str", "?").strip()
@@ -79,6 +112,7 @@ def build_ydl_opts(
     output_dir: Path,
 ) -> Dict[str, Any]:
     """Build yt-dlp options dictionary from DownloadRequest."""
+    ffmpeg = ffmpeg_available()
 
     # Base options
     opts = {
@@ -86,14 +120,19 @@ def build_ydl_opts(
         "progress_hooks": [_make_progress_hook(str(output_dir.name))],
         "retries": config.RETRY_ATTEMPTS,
         "socket_timeout": config.SOCKET_TIMEOUT,
-        "concurrent_fragment_downloads": config.CONCURRENT_FRAGMENTS if ffmpeg_available() else 4,
+        "concurrent_fragment_downloads": config.CONCURRENT_FRAGMENTS if ffmpeg else 4,
         "ignoreerrors": False,
         "no_color": True,
         "extractor_retries": 3,
         "fragment_retries": 10,
         "file_access_retries": 3,
         "nocheckcertificate": False,
+        # Scoped per YoutubeDL instance (merged over yt-dlp's std_headers),
+        # so concurrent downloads never touch shared global state
+        "http_headers": {"User-Agent": USER_AGENT},
     }
+    # Postprocessors in run order; attached to opts once at the end
+    pps: list[dict] = []
 
     # Output template (sanitized to prevent path traversal)
     if request.output_template:
@@ -115,15 +154,14 @@ def build_ydl_opts(
     elif request.extract_audio or request.quality == VideoQuality.AUDIO_ONLY:
         opts["format"] = "bestaudio/best"
         if request.audio_format:
-            opts["postprocessors"] = [
-                {
-                    "key": "FFmpegExtractAudio",
-                    "preferredcodec": request.audio_format.value,
-                    "preferredquality": request.audio_quality if request.audio_quality else "192",
-                }
-            ]
+            pps.append({
+                "key": "FFmpegExtractAudio",
+                "preferredcodec": request.audio_format.value,
+                "preferredquality": request.audio_quality if request.audio_quality else "192",
+            })
     else:
         quality_opts = get_quality_format(request.quality or VideoQuality.VIDEO_720P)
+        pps.extend(quality_opts.pop("postprocessors", ()))
         opts.update(quality_opts)
 
         if request.video_codec:
@@ -132,13 +170,10 @@ def build_ydl_opts(
 
     # Audio format/quality (for video downloads with audio)
     if request.audio_format and not request.extract_audio:
-        opts["postprocessors"] = opts.get("postprocessors", [])
-        opts["postprocessors"].append(
-            {
-                "key": "FFmpegAudioConvertor",
-                "preferredcodec": request.audio_format.value,
-            }
-        )
+        pps.append({
+            "key": "FFmpegAudioConvertor",
+            "preferredcodec": request.audio_format.value,
+        })
 
     # Subtitles
     if request.subtitles:
@@ -149,21 +184,19 @@ def build_ydl_opts(
             opts["subtitleslangs"] = ["en"]
 
     # Metadata & Thumbnails
-    if request.embed_thumbnail and ffmpeg_available():
+    if request.embed_thumbnail and ffmpeg:
         opts["writethumbnail"] = True
-        opts["postprocessors"] = opts.get("postprocessors", [])
-        opts["postprocessors"].append({
+        pps.append({
             "key": "FFmpegThumbnailsConvertor",
             "format": "png",
         })
-        opts["postprocessors"].append({
+        pps.append({
             "key": "EmbedThumbnail",
             "already_have_thumbnail": False,
         })
 
     if request.add_metadata:
-        opts["postprocessors"] = opts.get("postprocessors", [])
-        opts["postprocessors"].append({"key": "FFmpegMetadata"})
+        pps.append({"key": "FFmpegMetadata"})
 
     if request.write_thumbnail:
         opts["writethumbnail"] = True
@@ -215,30 +248,29 @@ def build_ydl_opts(
     if request.wait_for_video:
         opts["wait_for_video"] = request.wait_for_video
 
+    if pps:
+        opts["postprocessors"] = pps
+
     logger.debug(f"Built ydl_opts with {len(opts)} configuration options")
     return opts
 
 
-def _parse_size(size_str: str) -> int:
-    """Parse size string (e.g., '1M', '500K', '1G') to bytes."""
-    size_str = size_str.upper().strip()
-
-    multipliers = {
-        "K": 1024,
-        "M": 1024 * 1024,
-        "G": 1024 * 1024 * 1024,
-    }
+# Size suffix (last character, uppercased) → multiplier
+_SIZE_MULTIPLIERS = {
+    "K": 1024,
+    "M": 1024 * 1024,
+    "G": 1024 * 1024 * 1024,
+    "T": 1024 * 1024 * 1024 * 1024,
+}
 
-    for suffix, multiplier in multipliers.items():
-        if size_str.endswith(suffix):
-            try:
-                num = float(size_str[:-1])
-                return int(num * multiplier)
-            except ValueError:
-                logger.warning(f"Invalid size format: {size_str}")
-                return 0
 
+def _parse_size(size_str: str) -> int:
+    """Parse size string (e.g., '1M', '500K', '1G') to bytes."""
+    size_str = size_str.strip()
     try:
+        multiplier = _SIZE_MULTIPLIERS.get(size_str[-1:].upper())
+        if multiplier:
+            return int(float(size_str[:-1]) * multiplier)
         return int(size_str)
     except ValueError:
         logger.warning(f"Invalid size format: {size_str}")
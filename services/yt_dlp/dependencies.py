@@ -1,15 +1,34 @@
 """YouTube service setup — FFmpeg & Deno auto-download."""
 
 import os
+import shutil
 import zipfile
 import logging
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from urllib.request import urlretrieve
+from urllib.request import urlopen
+
+from .utils import ffmpeg_available
 
 logger = logging.getLogger(__name__)
 
 BIN_DIR = Path(__file__).parent / "bin"
 
+# Archives up to this size stay in memory; larger ones spill to a temp file
+SPOOL_MAX_SIZE = 64 << 20
+
+
+@contextmanager
+def _open_archive(url: str):
+    """Download a zip archive into a spooled temp file and open it for reading."""
+    with urlopen(url) as response, tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as spool:
+        shutil.copyfileobj(response, spool, 1 << 20)
+        spool.seek(0)
+        with zipfile.ZipFile(spool, "r") as zip_ref:
+            yield zip_ref
+
 
 def download_ffmpeg() -> bool:
     """Download and extract FFmpeg to service bin directory."""
@@ -24,17 +43,13 @@ def download_ffmpeg() -> bool:
         BIN_DIR.mkdir(parents=True, exist_ok=True)
 
         url = "https://www.gyan.dev/ffmpeg/builds/ffmpeg-release-essentials.zip"
-        zip_path = BIN_DIR.parent / "ffmpeg_temp.zip"
 
         logger.info(f"Downloading from {url}")
-        urlretrieve(url, zip_path)
-        logger.info("Download complete. Extracting...")
-
-        with zipfile.ZipFile(zip_path, "r") as zip_ref:
+        with _open_archive(url) as zip_ref:
+            logger.info("Download complete. Extracting...")
             bin_files = [f for f in zip_ref.namelist() if "/bin/" in f and f.endswith(".exe")]
             if not bin_files:
                 logger.error("No FFmpeg executables found in archive")
-                zip_path.unlink(missing_ok=True)
                 return False
 
             for file in bin_files:
@@ -42,10 +57,9 @@ def download_ffmpeg() -> bool:
                 with zip_ref.open(file) as source:
                     target_file = BIN_DIR / filename
                     with open(target_file, "wb") as target:
-                        target.write(source.read())
+                        shutil.copyfileobj(source, target, 1 << 20)
                 logger.debug(f"Extracted {filename}")
 
-        zip_path.unlink(missing_ok=True)
         logger.info(f"FFmpeg installed to {BIN_DIR}")
         return True
 
@@ -68,16 +82,12 @@ def download_deno() -> bool:
         BIN_DIR.mkdir(parents=True, exist_ok=True)
 
         url = "https://github.com/denoland/deno/releases/latest/download/deno-x86_64-pc-windows-msvc.zip"
-        zip_path = BIN_DIR.parent / "deno_temp.zip"
 
         logger.info(f"Downloading Deno from GitHub releases...")
-        urlretrieve(url, zip_path)
-        logger.info("Download complete. Extracting...")
-
-        with zipfile.ZipFile(zip_path, "r") as zip_ref:
+        with _open_archive(url) as zip_ref:
+            logger.info("Download complete. Extracting...")
             zip_ref.extract("deno.exe", BIN_DIR)
 
-        zip_path.unlink(missing_ok=True)
         logger.info(f"Deno installed to {BIN_DIR}")
         return True
 
@@ -89,10 +99,16 @@ def download_deno() -> bool:
 
 def setup_dependencies():
     """Download FFmpeg and Deno, add bin/ to PATH."""
-    download_ffmpeg()
-    download_deno()
+    # Both downloads are network-bound; fetch them side by side
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="deps") as pool:
+        futures = [pool.submit(download_ffmpeg), pool.submit(download_deno)]
+        for future in futures:
+            future.result()
 
     bin_path = str(BIN_DIR.absolute())
     if bin_path not in os.environ.get("PATH", ""):
         os.environ["PATH"] = f"{bin_path}{os.pathsep}{os.environ.get('PATH', '')}"
         logger.debug(f"Added {bin_path} to PATH")
+
+    # A fresh install or PATH change can flip the answer; re-probe on next use
+    ffmpeg_available.cache_clear()
@@ -3,7 +3,10 @@
 Auto-loaded by the service loader for the tester Docs tab.
 """
 
-NOTES = [
+from types import MappingProxyType
+from typing import Any, Mapping
+
+NOTES: tuple[str, ...] = (
     "Returns the file directly as a binary download — save to disk",
     "Supports <strong>1000+</strong> sites including YouTube, Facebook, Instagram, TikTok, Twitter/X, Reddit, Vimeo, SoundCloud, Twitch, and more",
     "Use <code>extract_audio: true</code> to get audio-only output",
@@ -12,9 +15,10 @@ NOTES = [
     "<strong>Playlist support:</strong> pass a playlist URL and all videos download with your chosen quality — response returns a JSON file list with individual play/download links",
     "Playlist quality: use <code>quality</code>, <code>extract_audio</code>, <code>video_codec</code>, etc. — settings apply to <strong>every video</strong> in the playlist",
     "Use <code>playlist_start</code> / <code>playlist_end</code> to limit which videos to download from a playlist",
-]
+)
 
-EXAMPLES = [
+# Read-only so the docs/tester code can never edit the shared examples in place
+EXAMPLES: tuple[Mapping[str, Any], ...] = tuple(MappingProxyType(e) for e in [
     {
         "title": "YouTube Video (720p)",
         "description": "Download a YouTube video at 720p quality",
@@ -105,7 +109,7 @@ EXAMPLES = [
         "description": "Download with embedded metadata and thumbnail",
         "body": {"url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ", "add_metadata": True, "embed_thumbnail": True},
     },
-]
+])
 
 CODE_EXAMPLES = {
     "curl": '''curl -X POST '{base_url}/unidl' \\
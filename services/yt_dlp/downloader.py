@@ -2,11 +2,13 @@
 
 import asyncio
 import logging
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Optional
 
-import yt_dlp
-from tenacity import retry, wait_exponential, stop_after_attempt, retry_if_exception_type
+from tenacity import retry, wait_exponential, stop_after_attempt, retry_if_exception
 
 from . import config
 from .models import DownloadRequest
@@ -14,6 +16,14 @@ from .config_builder import build_ydl_opts
 
 logger = logging.getLogger(__name__)
 
+# Lowercased suffixes (with the dot, as Path.suffix gives them)
+MEDIA_EXTS = frozenset({".mp4", ".webm", ".mkv", ".mp3", ".m4a", ".opus", ".wav", ".ogg", ".flac"})
+SKIP_EXTS = frozenset({".json", ".txt", ".description", ".jpg", ".jpeg", ".png", ".webp", ".part", ".ytdl"})
+
+# yt-dlp downloads block a thread for their whole duration; give them their own
+# bounded pool so they queue up instead of starving the default executor
+_DL_POOL = ThreadPoolExecutor(max_workers=config.MAX_CONCURRENT_DOWNLOADS, thread_name_prefix="ytdl")
+
 
 def _sanitize_filename(name: str) -> str:
     """Remove characters illegal in Windows paths."""
@@ -24,75 +34,97 @@ def _sanitize_filename(name: str) -> str:
     return sanitized or 'download'
 
 
+def _is_retryable(exc: BaseException) -> bool:
+    """DownloadError or a yt-dlp internals hiccup (Attribute/TypeError)."""
+    import yt_dlp
+
+    return isinstance(exc, (yt_dlp.utils.DownloadError, AttributeError, TypeError))
+
+
 @retry(
     wait=wait_exponential(multiplier=1, min=2, max=10),
     stop=stop_after_attempt(config.RETRY_ATTEMPTS),
-    retry=retry_if_exception_type((yt_dlp.utils.DownloadError, AttributeError, TypeError)),
+    retry=retry_if_exception(_is_retryable),
     reraise=True,
 )
-def _download_with_retry(url: str, ydl_opts: dict) -> dict:
+def _download_with_retry(url: str, ydl_opts: dict, warm: Optional[list] = None) -> dict:
     """Download with automatic retry using exponential backoff.
 
-    Creates a fresh YoutubeDL instance per attempt to avoid stale state.
-    Retries on DownloadError, AttributeError, and TypeError (yt-dlp internals).
+    The first attempt may reuse an already-built YoutubeDL handed over in
+    ``warm`` (the probe instance); every retry creates a fresh one to avoid
+    stale state. Retries on DownloadError, AttributeError, and TypeError
+    (yt-dlp internals).
     """
+    import yt_dlp
+
+    if warm:
+        return warm.pop().extract_info(url, download=True)
     with yt_dlp.YoutubeDL(ydl_opts) as ydl:
         return ydl.extract_info(url, download=True)
 
 
 async def download_media(request: DownloadRequest, download_id: str) -> str:
     """Download video or audio from any supported site via yt-dlp."""
+    # yt-dlp is heavy to import; it loads on the first download, not at startup
+    import yt_dlp
 
     url = str(request.url)
 
     output_dir = config.OUTPUT_DIR / download_id
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Set User-Agent
-    yt_dlp.utils.std_headers["User-Agent"] = (
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/120.0.0.0 Safari/537.36"
-    )
-
     # Build yt-dlp options from request
     ydl_opts = build_ydl_opts(request, output_dir)
 
     try:
         def download():
-            # Probe first (no download) to detect playlists
-            with yt_dlp.YoutubeDL({**ydl_opts, "extract_flat": True}) as probe:
-                info = probe.extract_info(url, download=False)
-
-            is_playlist = info and "entries" in info
-            if is_playlist:
-                playlist_title = _sanitize_filename(info.get("title", "playlist"))[:50]
-
-                playlist_folder = output_dir / playlist_title
-                playlist_folder.mkdir(parents=True, exist_ok=True)
-                ydl_opts["outtmpl"] = str(playlist_folder / "%(title).100B.%(ext)s")
-
-                _download_with_retry(url, ydl_opts)
-                return str(playlist_folder)
-            else:
-                _download_with_retry(url, ydl_opts)
-                return str(output_dir)
+            # Probe first (no download) to detect playlists. "in_playlist" keeps
+            # playlist entries unresolved (no per-video requests) but still
+            # follows a top-level redirect, so a link that resolves to a
+            # playlist is detected as one
+            with yt_dlp.YoutubeDL({**ydl_opts, "extract_flat": "in_playlist", "skip_download": True}) as ydl:
+                info = ydl.extract_info(url, download=False)
+
+                # Building a YoutubeDL (extractor registry, compiled regexes)
+                # is the expensive part, so the probe instance doubles as the
+                # first download attempt once the probe-only params are dropped
+                ydl.params.pop("extract_flat", None)
+                ydl.params.pop("skip_download", None)
+
+                is_playlist = info and "entries" in info
+                if is_playlist:
+                    playlist_title = _sanitize_filename(info.get("title", "playlist"))[:50]
+
+                    playlist_folder = output_dir / playlist_title
+                    playlist_folder.mkdir(parents=True, exist_ok=True)
+                    ydl_opts["outtmpl"] = str(playlist_folder / "%(title).100B.%(ext)s")
+                    ydl.params["outtmpl"]["default"] = ydl_opts["outtmpl"]
+
+                    _download_with_retry(url, ydl_opts, [ydl])
+                    return str(playlist_folder)
+                else:
+                    _download_with_retry(url, ydl_opts, [ydl])
+                    return str(output_dir)
 
         loop = asyncio.get_running_loop()
-        result_path = await loop.run_in_executor(None, download)
+        result_path = await loop.run_in_executor(_DL_POOL, download)
 
-        # Find downloaded files
+        # Find downloaded files in one directory pass; DirEntry caches the
+        # file type and (on Windows) the size, so there's no extra stat per file
         result_dir = Path(result_path)
-        files = list(result_dir.glob("*"))
-
-        MEDIA_EXTS = {".mp4", ".webm", ".mkv", ".mp3", ".m4a", ".opus", ".wav", ".ogg", ".flac"}
-        SKIP_EXTS = {".json", ".txt", ".description", ".jpg", ".jpeg", ".png", ".webp", ".part", ".ytdl"}
-
-        media_files = [f for f in files if f.is_file() and f.suffix.lower() in MEDIA_EXTS]
+        media_files, other_files = [], []
+        with os.scandir(result_dir) as it:
+            for entry in it:
+                if not entry.is_file():
+                    continue
+                ext = os.path.splitext(entry.name)[1].lower()
+                if ext in MEDIA_EXTS:
+                    media_files.append(entry)
+                elif ext not in SKIP_EXTS:
+                    other_files.append(entry)
 
         # Fallback: grab any non-metadata file if no known media extension matched
-        if not media_files:
-            media_files = [f for f in files if f.is_file() and f.suffix.lower() not in SKIP_EXTS]
+        media_files = media_files or other_files
 
         if not media_files:
             raise Exception("No media files downloaded")
@@ -103,7 +135,7 @@ async def download_media(request: DownloadRequest, download_id: str) -> str:
             logger.info(
                 f"Download completed: {download_id} -> {actual_file.name} ({file_size/1024/1024:.2f} MB)"
             )
-            return str(actual_file)
+            return actual_file.path
         else:
             total_size = sum(f.stat().st_size for f in media_files)
             logger.info(
@@ -9,13 +9,11 @@ from datetime import datetime
 from urllib.parse import quote
 
 from fastapi import APIRouter, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse
 
-import yt_dlp
-
-from utils import check_internet
+from utils import check_internet, ORJSONResponse
 from .models import DownloadRequest
-from .downloader import download_media
+from .downloader import SKIP_EXTS, download_media
 from . import config
 
 router = APIRouter(prefix="/unidl", tags=["Download"])
@@ -36,6 +34,9 @@ MEDIA_TYPES = {
     ".ssa": "text/x-ssa",
 }
 
+AUDIO_EXTS = frozenset({".mp3", ".m4a", ".opus", ".wav", ".ogg", ".flac"})
+SUBTITLE_EXTS = frozenset({".vtt", ".srt", ".ass", ".ssa"})
+
 # Track active playlist downloads for file serving
 _active_downloads: dict[str, Path] = {}
 
@@ -115,6 +116,9 @@ async def unidl(request: DownloadRequest, background_tasks: BackgroundTasks):
 
     logger.info(f"✓ Download started: {download_id} - {request.url} ({quality_str})")
 
+    # Deferred so an idle server never imports yt-dlp; cached after first use
+    import yt_dlp
+
     try:
         file_path = await download_media(request, download_id)
     except yt_dlp.utils.DownloadError as e:
@@ -127,9 +131,6 @@ async def unidl(request: DownloadRequest, background_tasks: BackgroundTasks):
 
     # If result is a directory (playlist), return JSON with file list
     if path.is_dir():
-        MEDIA_EXTS = {".mp4", ".webm", ".mkv", ".mp3", ".m4a", ".opus", ".wav", ".ogg", ".flac"}
-        SKIP_EXTS = {".json", ".txt", ".description", ".jpg", ".jpeg", ".png", ".webp", ".part", ".ytdl"}
-
         files = sorted(
             [f for f in path.rglob("*") if f.is_file() and f.suffix.lower() not in SKIP_EXTS],
             key=lambda f: f.name,
@@ -149,7 +150,7 @@ async def unidl(request: DownloadRequest, background_tasks: BackgroundTasks):
                 "filename": f.name,
                 "size": file_size,
                 "size_formatted": f"{file_size / 1024 / 1024:.2f} MB" if file_size > 1024 * 1024 else f"{file_size / 1024:.1f} KB",
-                "type": "audio" if ext in {".mp3", ".m4a", ".opus", ".wav", ".ogg", ".flac"} else "video",
+                "type": "audio" if ext in AUDIO_EXTS else "video",
                 "media_type": MEDIA_TYPES.get(ext, "application/octet-stream"),
                 "download_url": f"/unidl/file/{download_id}/{quote(f.name)}",
             })
@@ -164,7 +165,7 @@ async def unidl(request: DownloadRequest, background_tasks: BackgroundTasks):
 
         background_tasks.add_task(delayed_cleanup)
 
-        return JSONResponse({
+        return ORJSONResponse({
             "success": True,
             "playlist": True,
             "download_id": download_id,
@@ -179,7 +180,6 @@ async def unidl(request: DownloadRequest, background_tasks: BackgroundTasks):
     encoded = quote(filename)
 
     # Check for subtitle files alongside the video
-    SUBTITLE_EXTS = {".vtt", ".srt", ".ass", ".ssa"}
     download_dir = config.OUTPUT_DIR / download_id
     subtitle_files = [
         f for f in download_dir.rglob("*")
@@ -199,7 +199,7 @@ async def unidl(request: DownloadRequest, background_tasks: BackgroundTasks):
             "filename": path.name,
             "size": file_size,
             "size_formatted": f"{file_size / 1024 / 1024:.2f} MB" if file_size > 1024 * 1024 else f"{file_size / 1024:.1f} KB",
-            "type": "audio" if ext in {".mp3", ".m4a", ".opus", ".wav", ".ogg", ".flac"} else "video",
+            "type": "audio" if ext in AUDIO_EXTS else "video",
             "media_type": MEDIA_TYPES.get(ext, "application/octet-stream"),
             "download_url": f"/unidl/file/{download_id}/{quote(path.name)}",
         })
@@ -225,7 +225,7 @@ async def unidl(request: DownloadRequest, background_tasks: BackgroundTasks):
 
         background_tasks.add_task(delayed_cleanup)
 
-        return JSONResponse({
+        return ORJSONResponse({
             "success": True,
             "playlist": False,
             "has_subtitles": True,
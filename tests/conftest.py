@@ -4,6 +4,7 @@ import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import patch
 
+import main
 from main import app
 
 
@@ -20,3 +21,13 @@ def mock_internet_check():
          patch('main.check_internet', return_value=True), \
          patch('services.yt_dlp.endpoints.check_internet', return_value=True):
         yield mock
+
+
+@pytest.fixture(autouse=True)
+def reset_internet_status():
+    """Forget the cached internet probe so each test sees its own mock."""
+    main._internet_ok = None
+    main._internet_checked_at = 0.0
+    yield
+    main._internet_ok = None
+    main._internet_checked_at = 0.0
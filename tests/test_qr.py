@@ -1,6 +1,7 @@
 """Tests for QR code service."""
 
 import pytest
+from unittest.mock import patch
 from fastapi.testclient import TestClient
 
 
@@ -40,6 +41,21 @@ def test_qr_empty_data_validation(test_client: TestClient):
     assert response.status_code == 422
 
 
+@pytest.mark.unit
+def test_qr_scale_border_range_validation(test_client: TestClient):
+    """Test out-of-range scale/border values are rejected."""
+    for body in ({"scale": 0}, {"scale": 101}, {"border": -1}):
+        response = test_client.post("/qr", json={"data": "range", **body})
+        assert response.status_code == 422
+
+
+@pytest.mark.unit
+def test_qr_micro_overflow_rejected(test_client: TestClient):
+    """Test data too long for any Micro QR fails validation up front."""
+    response = test_client.post("/qr", json={"data": "x" * 36, "micro": True})
+    assert response.status_code == 422
+
+
 @pytest.mark.unit
 def test_qr_wifi(test_client: TestClient):
     """Test WiFi QR code generation."""
@@ -79,3 +95,72 @@ def test_qr_metadata_headers(test_client: TestClient):
     assert "X-QR-Size" in response.headers
     assert "X-QR-Data-Length" in response.headers
     assert "X-Generated-At" in response.headers
+
+
+@pytest.mark.unit
+def test_qr_render_cache_and_etag(test_client: TestClient):
+    """Test identical requests reuse the cached render and revalidate via ETag."""
+    import segno
+
+    payload = {"data": "cache me", "format": "svg"}
+    first = test_client.post("/qr", json=payload)
+    with patch("segno.make", wraps=segno.make) as make:
+        second = test_client.post("/qr", json=payload)
+
+    assert second.content == first.content
+    make.assert_not_called()
+
+    etag = first.headers["ETag"]
+    response = test_client.post("/qr", json=payload, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+
+
+@pytest.mark.unit
+def test_qr_admin_cache_clear(test_client: TestClient, monkeypatch):
+    """Test the debug-only admin route empties the render cache."""
+    from config import Config
+    from services.qr import generator
+
+    test_client.post("/qr", json={"data": "to be cleared"})
+
+    monkeypatch.setattr(Config, "DEBUG", False)
+    assert test_client.delete("/qr/admin/cache").status_code == 404
+
+    monkeypatch.setattr(Config, "DEBUG", True)
+    response = test_client.delete("/qr/admin/cache")
+
+    assert response.status_code == 200
+    assert response.json()["cleared"] >= 1
+    assert not generator._render_cache
+    assert generator._render_cache_bytes == 0
+
+
+@pytest.mark.unit
+def test_qr_render_cache_bounded_by_bytes(monkeypatch):
+    """Test the render cache evicts by total bytes and skips oversized renders."""
+    from services.qr import generator
+    from services.qr.models import QRRequest
+
+    generator.clear_render_cache()
+    image, _ = generator.generate_qr_code(QRRequest(data="bounded 0", format="png"))
+    monkeypatch.setattr(generator, "RENDER_CACHE_MAX_BYTES", 3 * (len(image) + 16))
+
+    for i in range(10):
+        generator.generate_qr_code(QRRequest(data=f"bounded {i}", format="png"))
+    assert 0 < len(generator._render_cache) < 10
+    assert generator._render_cache_bytes <= generator.RENDER_CACHE_MAX_BYTES
+
+    monkeypatch.setattr(generator, "RENDER_CACHE_MAX_ITEM_BYTES", 10)
+    generator.clear_render_cache()
+    generator.generate_qr_code(QRRequest(data="too big to keep", format="png"))
+    assert not generator._render_cache
+
+
+@pytest.mark.unit
+def test_qr_admin_route_not_advertised(test_client: TestClient):
+    """Test the admin route stays out of /api and the route count."""
+    qr_info = test_client.get("/api").json()["services"]["qr"]
+
+    assert qr_info["routes"] == 1
+    assert all("admin" not in ep["path"] for ep in qr_info["endpoints"])
@@ -1,12 +1,14 @@
 """Tests for server endpoints and shared utilities."""
 
 import socket
+import time
 
 import pytest
 from unittest.mock import patch, Mock
 from fastapi.testclient import TestClient
 
-from utils import check_internet
+import main
+from utils import check_internet, etag_matches
 
 
 # ── Server Endpoint Tests ──────────────────────────────────────────────
@@ -88,6 +90,30 @@ def test_root_lists_services(test_client: TestClient):
         assert service_info["routes"] > 0
 
 
+@pytest.mark.unit
+def test_health_uses_cached_internet_status(test_client: TestClient):
+    """Test health reports the polled internet status without probing."""
+    main._internet_ok = True
+    main._internet_checked_at = time.monotonic()
+    with patch('main.check_internet') as mock_check:
+        response = test_client.get("/health")
+
+    assert response.json()["internet"] is True
+    mock_check.assert_not_called()
+
+
+@pytest.mark.unit
+def test_health_reprobes_stale_internet_status(test_client: TestClient):
+    """Test health probes again once the cached status is past its TTL."""
+    main._internet_ok = True
+    main._internet_checked_at = time.monotonic() - main.INTERNET_TTL - 1
+    with patch('main.check_internet', return_value=False) as mock_check:
+        response = test_client.get("/health")
+
+    assert response.json()["internet"] is False
+    mock_check.assert_called_once()
+
+
 @pytest.mark.integration
 def test_health_check_accessibility(test_client: TestClient):
     """Test health check is accessible and returns valid JSON."""
@@ -124,6 +150,50 @@ def test_docs_disabled(test_client: TestClient):
     assert test_client.get("/redoc").status_code == 404
 
 
+@pytest.mark.unit
+def test_tester_page_etag(test_client: TestClient):
+    """Test tester UI sends an ETag and honours If-None-Match."""
+    response = test_client.get("/")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/html")
+    etag = response.headers["etag"]
+
+    cached = test_client.get("/", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+
+@pytest.mark.unit
+def test_log_listener_survives_repeated_lifespans(mock_internet_check):
+    """Test back-to-back lifespans shut down cleanly and logs keep draining."""
+    for _ in range(2):
+        with TestClient(main.create_app()):
+            pass
+
+    start = main._log_cursor
+    main.logger.warning("after second shutdown")
+    deadline = time.monotonic() + 2
+    while main._log_cursor == start and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert main._log_cursor > start
+
+
+@pytest.mark.unit
+def test_uvicorn_logs_reach_sse_after_uvicorn_config(mock_internet_check):
+    """Test uvicorn's logging dictConfig doesn't cut its loggers off the SSE queue."""
+    import logging
+    import uvicorn
+    from logging.handlers import QueueHandler
+
+    uvicorn.Config(main.app)  # applies uvicorn's LOGGING_CONFIG, like uvicorn.run
+    with TestClient(main.app):
+        for name in ("uvicorn", "uvicorn.access", "uvicorn.error"):
+            handlers = logging.getLogger(name).handlers
+            assert sum(isinstance(h, QueueHandler) and h.queue is main._log_queue for h in handlers) == 1
+
+
 # ── Shared Utility Tests ──────────────────────────────────────────────
 
 
@@ -164,3 +234,16 @@ def test_check_internet_custom_timeout():
         call_args = mock_conn.call_args
         assert call_args[1]['timeout'] == 2
         mock_socket.close.assert_called_once()
+
+
+@pytest.mark.unit
+def test_etag_matches():
+    """Test If-None-Match parsing: lists, wildcard and weak comparison."""
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches('"x", "abc"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert etag_matches('W/"abc"', '"abc"')
+    assert etag_matches('"abc"', 'W/"abc"')
+    assert not etag_matches('"abcd"', '"abc"')
+    assert not etag_matches(None, '"abc"')
+    assert not etag_matches("", '"abc"')
@@ -1,11 +1,12 @@
 """Tests for TTS service."""
 
+import asyncio
 import tempfile
 import shutil
 from pathlib import Path
 
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 from fastapi.testclient import TestClient
 
 from services.edge_tts import config as tts_config
@@ -64,9 +65,8 @@ def test_tts_generate_post_success(test_client: TestClient, sample_tts_request,
     assert response.status_code == 200
     assert response.headers["content-type"] == "audio/mpeg"
     assert "X-TTS-Voice" in response.headers
-    assert "X-Audio-Size" in response.headers
     assert "X-Text-Length" in response.headers
-    assert len(response.content) > 0
+    assert response.content == b"fake_audio_data_more_data"
 
 
 @pytest.mark.unit
@@ -93,6 +93,16 @@ def test_tts_text_too_long_validation(test_client: TestClient):
     assert response.status_code == 422
 
 
+@pytest.mark.unit
+def test_tts_invalid_prosody_rejected_before_synthesis(test_client: TestClient, mock_edge_tts):
+    """Test malformed rate/volume/pitch values fail validation without reaching Edge TTS."""
+    for field, value in (("rate", "fast"), ("volume", "10%"), ("pitch", "+5Hzz")):
+        response = test_client.post("/tts", json={"text": "Hello", field: value})
+        assert response.status_code == 422
+
+    mock_edge_tts.assert_not_called()
+
+
 @pytest.mark.unit
 def test_tts_full_voice_id(test_client: TestClient, mock_edge_tts):
     """Test TTS generation with full voice ID."""
@@ -157,16 +167,27 @@ def test_tts_metadata_headers(test_client: TestClient, mock_edge_tts):
     assert "X-TTS-Voice" in response.headers
     assert "X-TTS-Rate" in response.headers
     assert "X-TTS-Pitch" in response.headers
-    assert "X-Audio-Size" in response.headers
     assert "X-Text-Length" in response.headers
     assert "X-Generated-At" in response.headers
 
     assert response.headers["X-TTS-Rate"] == "+10%"
     assert response.headers["X-TTS-Pitch"] == "-2Hz"
-    assert int(response.headers["X-Audio-Size"]) > 0
     assert response.headers["X-Text-Length"] == "12"
 
 
+@pytest.mark.unit
+def test_tts_audio_size_header_on_cache_hit(test_client: TestClient, sample_tts_request, mock_edge_tts):
+    """Test fresh audio is streamed without a size and cached audio reports it."""
+    streamed = test_client.post("/tts", json=sample_tts_request)
+    assert streamed.status_code == 200
+    assert "X-Audio-Size" not in streamed.headers
+
+    cached = test_client.post("/tts", json=sample_tts_request)
+    assert cached.status_code == 200
+    assert int(cached.headers["X-Audio-Size"]) == len(streamed.content)
+    assert cached.content == streamed.content
+
+
 @pytest.mark.unit
 def test_tts_cache_control_header(test_client: TestClient, mock_edge_tts):
     """Test TTS response includes cache control header."""
@@ -180,6 +201,178 @@ def test_tts_cache_control_header(test_client: TestClient, mock_edge_tts):
     assert "public" in response.headers["Cache-Control"]
 
 
+@pytest.mark.unit
+def test_tts_memory_cache_hit(test_client: TestClient, sample_tts_request, mock_edge_tts, temp_cache_dir):
+    """Test repeat requests are served from memory without touching disk."""
+    first = test_client.post("/tts", json=sample_tts_request)
+    assert first.status_code == 200
+
+    for cached_file in temp_cache_dir.glob("*.mp3"):
+        cached_file.unlink()
+
+    second = test_client.post("/tts", json=sample_tts_request)
+    assert second.status_code == 200
+    assert second.content == first.content
+    assert mock_edge_tts.call_count == 1
+
+
+@pytest.mark.unit
+def test_tts_cache_single_flight():
+    """Test concurrent identical misses share one synthesis."""
+    from services.edge_tts.cache import cache
+
+    calls = 0
+
+    async def producer():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        yield b"shared_"
+        yield b"audio"
+
+    async def fetch():
+        _, result = await cache.get_or_stream(("en-US-GuyNeural", "+0%", "+0Hz", "+0%", "Single flight"), producer)
+        if isinstance(result, bytes):
+            return result
+        return b"".join([chunk async for chunk in result])
+
+    async def burst():
+        return await asyncio.gather(*(fetch() for _ in range(5)))
+
+    results = asyncio.run(burst())
+
+    assert results == [b"shared_audio"] * 5
+    assert calls == 1
+
+
+@pytest.mark.unit
+def test_tts_single_flight_survives_leader_disconnect():
+    """Test a stalled or disconnected leader doesn't fail the follower waiting on it."""
+    from services.edge_tts.cache import cache
+
+    key = ("en-US-GuyNeural", "+0%", "+0Hz", "+0%", "Leader goes away")
+
+    async def producer():
+        yield b"first_"
+        await asyncio.sleep(0.05)
+        yield b"second"
+
+    async def scenario():
+        _, leader = await cache.get_or_stream(key, producer)
+        assert await leader.__anext__() == b"first_"
+
+        # The leader stops reading, then its client disconnects mid-stream
+        follower = asyncio.create_task(cache.get_or_stream(key, producer))
+        await asyncio.sleep(0.01)
+        assert not follower.done()
+        await leader.aclose()
+
+        _, follower_audio = await asyncio.wait_for(follower, 1)
+        return follower_audio
+
+    assert asyncio.run(scenario()) == b"first_second"
+
+
+@pytest.mark.unit
+def test_tts_stream_single_flight():
+    """Test overlapping identical stream requests make one upstream call."""
+    from services.edge_tts.engine import stream_tts
+
+    def fake_communicate(text, voice, **kwargs):
+        instance = Mock()
+
+        def fake_stream():
+            async def _generator():
+                yield {"type": "audio", "data": b"first_"}
+                await asyncio.sleep(0.05)
+                yield {"type": "audio", "data": b"second"}
+            return _generator()
+
+        instance.stream = fake_stream
+        return instance
+
+    async def fetch():
+        _, audio = await stream_tts("Overlapping request", "en-US-GuyNeural")
+        if isinstance(audio, bytes):
+            return audio
+        return b"".join([chunk async for chunk in audio])
+
+    async def burst():
+        return await asyncio.gather(*(fetch() for _ in range(4)))
+
+    with patch('edge_tts.Communicate', side_effect=fake_communicate) as mock:
+        results = asyncio.run(burst())
+
+    assert results == [b"first_second"] * 4
+    assert mock.call_count == 1
+
+
+@pytest.mark.unit
+def test_tts_etag_revalidation(test_client: TestClient, sample_tts_request, mock_edge_tts):
+    """Test cached audio carries an ETag and matching revalidation gets a 304."""
+    test_client.post("/tts", json=sample_tts_request)
+    cached = test_client.post("/tts", json=sample_tts_request)
+    etag = cached.headers["ETag"]
+
+    response = test_client.post("/tts", json=sample_tts_request, headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+    listed = test_client.post("/tts", json=sample_tts_request, headers={"If-None-Match": f'"other", {etag}'})
+    assert listed.status_code == 304
+    wildcard = test_client.post("/tts", json=sample_tts_request, headers={"If-None-Match": "*"})
+    assert wildcard.status_code == 304
+
+
+@pytest.mark.unit
+def test_tts_list_voices_cached(test_client: TestClient, monkeypatch):
+    """Test the voice list is fetched once and reused within its TTL."""
+    from services.edge_tts import endpoints as tts_endpoints
+
+    monkeypatch.setattr(tts_endpoints, "_voices_cache", None)
+    voices = [{"Locale": "en-US", "ShortName": "en-US-GuyNeural", "Gender": "Male"}]
+
+    with patch('edge_tts.list_voices', new=AsyncMock(return_value=voices)) as mock_list:
+        first = test_client.post("/tts", json={"list_voices": True})
+        second = test_client.post("/tts", json={"list_voices": True})
+
+    assert first.status_code == 200
+    assert second.json() == first.json()
+    assert first.json()["voices"]["en-US"][0]["name"] == "en-US-GuyNeural"
+    mock_list.assert_awaited_once()
+
+
+@pytest.mark.unit
+def test_tts_parallel_sentences_keep_order(test_client: TestClient, monkeypatch):
+    """Test parallel sentence synthesis stitches audio back in text order."""
+    monkeypatch.setattr(tts_config, "PARALLEL_TTS", True)
+
+    def fake_communicate(text, voice, **kwargs):
+        instance = Mock()
+
+        def fake_stream():
+            async def _generator():
+                # Later sentences finish first
+                await asyncio.sleep(0.01 if text.startswith("First") else 0)
+                yield {"type": "audio", "data": f"[{text}]".encode()}
+            return _generator()
+
+        instance.stream = fake_stream
+        return instance
+
+    with patch('edge_tts.Communicate', side_effect=fake_communicate) as mock:
+        response = test_client.post("/tts", json={
+            "text": "First sentence here. Second sentence, Dr. Who. Third one ends it!",
+            "voice": "ana"
+        })
+
+    assert response.status_code == 200
+    assert mock.call_count == 3
+    assert response.content == b"[First sentence here.][Second sentence, Dr. Who.][Third one ends it!]"
+
+
 @pytest.mark.unit
 def test_tts_invalid_json_post(test_client: TestClient):
     """Test POST endpoint handles invalid JSON."""
@@ -1,5 +1,6 @@
 """Tests for download service."""
 
+import logging
 import subprocess
 import tempfile
 import shutil
@@ -84,6 +85,8 @@ def test_youtube_download_returns_file(
     assert response.status_code == 200
     assert response.headers["content-type"] in ["video/mp4", "application/octet-stream"]
     assert len(response.content) > 0
+    # The probe instance is reused for the download itself
+    assert mock_ytdlp.call_count == 1
 
 
 @pytest.mark.unit
@@ -274,3 +277,52 @@ def test_check_ffmpeg_error():
     with patch('subprocess.run', side_effect=subprocess.CalledProcessError(1, 'ffmpeg')):
         result = check_ffmpeg()
         assert result is False
+
+
+# ── Progress Hook Tests ──────────────────────────────────────────────
+
+
+@pytest.mark.unit
+def test_progress_hook_logs_per_bucket(caplog):
+    """Test progress is logged once per 5% step, not on every callback."""
+    from services.yt_dlp.config_builder import _make_progress_hook
+
+    clock = iter(range(0, 1000, 5))
+    hook = _make_progress_hook("test", clock=lambda: next(clock))
+    total = 100 * 1024 * 1024
+
+    with caplog.at_level(logging.INFO, logger="download"):
+        for downloaded in range(0, 4 * 1024 * 1024, 64 * 1024):
+            hook({"status": "downloading", "downloaded_bytes": downloaded, "total_bytes": total})
+        assert len(caplog.records) == 1  # the 0% line
+
+        hook({"status": "downloading", "downloaded_bytes": total // 10, "total_bytes": total,
+              "_percent_str": "10.0%"})
+        assert len(caplog.records) == 2
+        assert "10.0%" in caplog.records[1].getMessage()
+
+
+@pytest.mark.unit
+def test_progress_bucket_backs_off_without_total():
+    """Test unknown-size progress buckets thin out logarithmically."""
+    from services.yt_dlp.config_builder import _progress_bucket
+
+    mib = 1024 * 1024
+    buckets = {_progress_bucket(n * mib, None) for n in range(10, 1000)}
+    # 10..99 → 90 buckets, 100..999 → 90 more (one per 10 MiB)
+    assert len(buckets) == 180
+
+
+@pytest.mark.unit
+def test_user_agent_scoped_to_instance(tmp_path):
+    """Test the User-Agent rides in ydl_opts instead of mutating yt-dlp's globals."""
+    import yt_dlp
+    from services.yt_dlp.config_builder import USER_AGENT, build_ydl_opts
+    from services.yt_dlp.models import DownloadRequest
+
+    before = dict(yt_dlp.utils.std_headers)
+    opts = build_ydl_opts(DownloadRequest(url="https://www.youtube.com/watch?v=dQw4w9WgXcQ"), tmp_path)
+
+    with yt_dlp.YoutubeDL(opts) as ydl:
+        assert ydl.params["http_headers"]["User-Agent"] == USER_AGENT
+    assert dict(yt_dlp.utils.std_headers) == before
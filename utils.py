@@ -2,6 +2,10 @@
 
 import socket
 import logging
+import time
+
+import orjson
+from fastapi.responses import JSONResponse
 
 logger = logging.getLogger(__name__)
 
@@ -15,3 +19,39 @@ def check_internet(timeout: int = 5) -> bool:
     except (OSError, socket.timeout) as e:
         logger.debug(f"Internet check failed: {e}")
         return False
+
+
+# (unix second, formatted) — response headers only need 1 s resolution
+_iso_cache: tuple[int, str] = (0, "")
+
+
+def utc_now_iso() -> str:
+    """Current UTC time as ISO 8601 ('2024-01-01T12:00:00Z'), formatted at most once a second."""
+    global _iso_cache
+    now = int(time.time())
+    second, formatted = _iso_cache
+    if now != second:
+        formatted = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now))
+        _iso_cache = (now, formatted)
+    return formatted
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Whether an If-None-Match header value matches ``etag``.
+
+    Accepts '*' and comma-separated lists, and compares weakly (a W/ prefix
+    on either side is ignored), as RFC 9110 specifies for If-None-Match.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson (much faster than stdlib json)."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)